@@ -2,10 +2,12 @@
 Admin Routes
 Admin-specific operations: verification, approvals, disbursements
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Header
 from typing import Dict, Optional
 from datetime import datetime
 import uuid
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.operators import Inc
 
 from app.models.orphanage import Orphanage, OrphanageStatus
 from app.models.campaign import Campaign, CampaignStatus
@@ -13,7 +15,14 @@ from app.models.report import Report, ReportStatus
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.models.user import User, UserRole
 from app.core.security import get_current_user_token
+from app.core.cache import invalidate_campaign, invalidate_orphanage, invalidate_user, orphanage_by_user, response_cache
+from app.core.dependencies import get_user
+from app.core.idempotency import idempotent
 from app.utils.email import send_orphanage_verification_email, send_fund_disbursement_email
+from app.utils.links import link_id
+from app.utils.stats import ensure_stats_seeded, increment_stats, get_stats, rebuild_stats
+from app.utils.counters import counters_sharded, flush_campaign_counters
+from app.utils.concurrency import gather_limited
 
 router = APIRouter()
 
@@ -34,21 +43,26 @@ async def verify_orphanage(
     """Verify or reject orphanage"""
     await verify_admin(token_data)
     
-    orphanage = await Orphanage.get(orphanage_id)
+    admin_id = token_data.get("sub")
+    orphanage, admin = await gather_limited(Orphanage.get(orphanage_id), get_user(admin_id))
     if not orphanage:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orphanage not found")
     
+    was_verified = orphanage.status == OrphanageStatus.VERIFIED
     orphanage.status = status
     orphanage.rejection_reason = rejection_reason
     orphanage.verified_at = datetime.utcnow()
-    
-    admin_id = token_data.get("sub")
-    admin = await User.get(admin_id)
     orphanage.verified_by = admin
+    orphanage.updated_at = datetime.utcnow()
+    orphanage.version += 1
     
     await orphanage.save()
     
-    # Send email notification
+    invalidate_orphanage(orphanage.id)
+    verified_delta = int(status == OrphanageStatus.VERIFIED) - int(was_verified)
+    await increment_stats({}, platform_deltas={"verified_orphanages": verified_delta})
+    
+    # Queue email notification
     try:
         await send_orphanage_verification_email(
             email=orphanage.email,
@@ -57,7 +71,7 @@ async def verify_orphanage(
             message=rejection_reason
         )
     except Exception as e:
-        print(f"Failed to send verification email: {str(e)}")
+        print(f"Failed to queue verification email: {str(e)}")
     
     return {"message": f"Orphanage {status.value} successfully"}
 
@@ -76,6 +90,7 @@ async def approve_campaign(
     if not campaign:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     
+    was_active = campaign.status == CampaignStatus.ACTIVE
     if approved:
         campaign.status = CampaignStatus.ACTIVE
         campaign.approved_at = datetime.utcnow()
@@ -85,33 +100,53 @@ async def approve_campaign(
         campaign.rejection_reason = rejection_reason
     
     await campaign.save()
+    invalidate_campaign(campaign.id)
+    
+    await increment_stats(
+        {"active_campaigns": int(approved) - int(was_active)},
+        orphanage_id=link_id(campaign.orphanage),
+    )
     
     return {"message": f"Campaign {'approved' if approved else 'rejected'} successfully"}
 
 
 @router.post("/campaigns/{campaign_id}/disburse")
+@idempotent("admin.disburse")
 async def disburse_funds(
     campaign_id: str,
     amount: float,
     disbursement_method: str = "bank_transfer",
     disbursement_reference: Optional[str] = None,
-    token_data: Dict = Depends(get_current_user_token)
+    token_data: Dict = Depends(get_current_user_token),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Disburse funds to orphanage"""
+    """Disburse funds to orphanage (retry-safe with an Idempotency-Key header)"""
     await verify_admin(token_data)
     
-    campaign = await Campaign.get(campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    # Fold pending donation shards first so the funds check sees every donation
+    if counters_sharded():
+        await flush_campaign_counters(PydanticObjectId(campaign_id))
     
-    # Validate amount
-    available = campaign.raised_amount - campaign.disbursed_amount
-    if amount > available:
+    # Check available funds and increment in one guarded update so concurrent
+    # disbursements can never exceed the raised amount
+    campaign = await Campaign.find_one(
+        Campaign.id == PydanticObjectId(campaign_id),
+        {"$expr": {"$gte": [{"$subtract": ["$raised_amount", "$disbursed_amount"]}, amount]}}
+    ).update(
+        Inc({Campaign.disbursed_amount: amount}),
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if not campaign:
+        if not await Campaign.get(campaign_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient funds")
+    invalidate_campaign(campaign.id)
     
-    # Update campaign
-    campaign.disbursed_amount += amount
-    await campaign.save()
+    await increment_stats(
+        {"total_disbursed": amount},
+        orphanage_id=link_id(campaign.orphanage),
+        campaign_id=campaign.id,
+    )
     
     # Create transaction
     await campaign.fetch_link(Campaign.orphanage)
@@ -129,7 +164,7 @@ async def disburse_funds(
     )
     await transaction.insert()
     
-    # Send email notification
+    # Queue email notification
     try:
         await send_fund_disbursement_email(
             orphanage_email=campaign.orphanage.email,
@@ -138,7 +173,7 @@ async def disburse_funds(
             amount=amount
         )
     except Exception as e:
-        print(f"Failed to send disbursement email: {str(e)}")
+        print(f"Failed to queue disbursement email: {str(e)}")
     
     return {
         "message": "Funds disbursed successfully",
@@ -151,52 +186,58 @@ async def get_pending_verifications(token_data: Dict = Depends(get_current_user_
     """Get all pending verifications"""
     await verify_admin(token_data)
     
-    pending_orphanages = await Orphanage.find(
-        Orphanage.status == OrphanageStatus.PENDING
-    ).to_list()
-    
-    pending_campaigns = await Campaign.find(
-        Campaign.status == CampaignStatus.PENDING_APPROVAL
-    ).to_list()
+    pending_orphanages, pending_campaigns = await gather_limited(
+        Orphanage.find(Orphanage.status == OrphanageStatus.PENDING).count(),
+        Campaign.find(Campaign.status == CampaignStatus.PENDING_APPROVAL).count(),
+    )
     
     return {
-        "orphanages": len(pending_orphanages),
-        "campaigns": len(pending_campaigns)
+        "orphanages": pending_orphanages,
+        "campaigns": pending_campaigns
     }
 
 
 @router.get("/dashboard")
 async def admin_dashboard(token_data: Dict = Depends(get_current_user_token)):
-    """Get admin dashboard statistics"""
+    """Get admin dashboard statistics
+
+    Reads the incrementally maintained platform rollup (see app.utils.stats) and
+    collection metadata counts, so the cost is constant regardless of data volume.
+    """
     await verify_admin(token_data)
     
-    total_orphanages = await Orphanage.count()
-    verified_orphanages = await Orphanage.find(
-        Orphanage.status == OrphanageStatus.VERIFIED
-    ).count()
-    
-    total_campaigns = await Campaign.count()
-    active_campaigns = await Campaign.find(
-        Campaign.status == CampaignStatus.ACTIVE
-    ).count()
-    
-    # Calculate total donations
-    from app.models.donation import Donation, DonationStatus
-    completed_donations = await Donation.find(
-        Donation.status == DonationStatus.COMPLETED
-    ).to_list()
-    total_donations = sum(d.amount for d in completed_donations)
+    stats, total_orphanages, total_campaigns = await gather_limited(
+        get_stats(),
+        Orphanage.get_motor_collection().estimated_document_count(),
+        Campaign.get_motor_collection().estimated_document_count(),
+    )
+    if stats is None or stats.rebuilt_at is None:
+        # Never seeded (startup seeding failed): an $inc-created doc counts from zero
+        await ensure_stats_seeded()
+        stats = await get_stats()
     
+    from app.models.donation import DonationStatus
     return {
         "total_orphanages": total_orphanages,
-        "verified_orphanages": verified_orphanages,
+        "verified_orphanages": stats.verified_orphanages,
         "total_campaigns": total_campaigns,
-        "active_campaigns": active_campaigns,
-        "total_donations": total_donations,
-        "total_donors": len(set(str(d.donor.id) for d in completed_donations))
+        "active_campaigns": stats.active_campaigns,
+        "total_donations": stats.total_raised,
+        "total_disbursed": stats.total_disbursed,
+        "total_donors": stats.total_donors,
+        "donations_by_status": {s.value: stats.donations_by_status.get(s.value, 0) for s in DonationStatus},
     }
 
 
+@router.post("/stats/rebuild")
+async def rebuild_platform_stats(token_data: Dict = Depends(get_current_user_token)):
+    """Recompute platform, orphanage and campaign rollups from source data (repairs drift)"""
+    await verify_admin(token_data)
+    
+    rebuilt = await rebuild_stats()
+    return {"message": "Stats rebuilt successfully", "rebuilt": rebuilt}
+
+
 @router.delete("/users")
 async def delete_users(
     all: bool = True,
@@ -277,6 +318,9 @@ async def delete_users(
     # Finally delete users
     res = await User.find(In(User.id, user_ids)).delete()
     deleted_users = res.matched_count if hasattr(res, "matched_count") else len(user_ids)
+    response_cache.clear()
+    orphanage_by_user.clear()
+    invalidate_user()
 
     return {
         "deleted_users": deleted_users,
@@ -4,13 +4,16 @@ User registration, login, and token management
 """
 from fastapi import APIRouter, HTTPException, status, Depends
 from datetime import timedelta
-from typing import Dict
+from typing import Dict, Optional
 
 from app.schemas.auth import UserRegister, UserLogin, Token, UserResponse, PasswordChange, OrphanageFullRegister
 from app.models.user import User, UserRole
-from app.core.security import hash_password, verify_password, create_access_token, get_current_user_token
+from app.core.security import hash_password_async, verify_password_async, password_needs_rehash, create_access_token, get_current_user_token
 from app.core.config import settings
 from app.utils.email import send_welcome_email
+from app.utils.concurrency import gather_limited
+from app.core.cache import invalidate_orphanage, invalidate_user
+from app.core.dependencies import get_authenticated_user
 
 
 router = APIRouter()
@@ -36,7 +39,7 @@ async def register(user_data: UserRegister):
         )
     
     # Create new user
-    hashed_pwd = hash_password(user_data.password)
+    hashed_pwd = await hash_password_async(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_pwd,
@@ -49,11 +52,11 @@ async def register(user_data: UserRegister):
     
     await new_user.insert()
     
-    # Send welcome email (non-blocking)
+    # Queue welcome email (delivered by the email worker)
     try:
         await send_welcome_email(new_user.email, new_user.full_name, new_user.role.value)
     except Exception as e:
-        print(f"Warning: Failed to send welcome email: {str(e)}")
+        print(f"Warning: Failed to queue welcome email: {str(e)}")
     
     # Create access token
     access_token = create_access_token(
@@ -88,19 +91,19 @@ async def register_orphanage(full: OrphanageFullRegister):
     - Creates user with role=orphanage, then orphanage document.
     - Rolls back user creation if orphanage creation fails.
     """
-    # 1) Email must be unique
-    existing_user = await User.find_one(User.email == full.email)
+    # 1) Email and 2) orphanage registration number must be unique (checked concurrently)
+    from app.models.orphanage import Orphanage, OrphanageStatus
+    existing_user, existing_reg = await gather_limited(
+        User.find_one(User.email == full.email),
+        Orphanage.find_one(Orphanage.registration_number == full.orphanage.registration_number),
+    )
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-
-    # 2) Orphanage registration number must be unique
-    from app.models.orphanage import Orphanage, OrphanageStatus
-    existing_reg = await Orphanage.find_one(Orphanage.registration_number == full.orphanage.registration_number)
     if existing_reg:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Registration number already exists")
 
     # 3) Create user
-    hashed_pwd = hash_password(full.password)
+    hashed_pwd = await hash_password_async(full.password)
     user = User(
         email=full.email,
         hashed_password=hashed_pwd,
@@ -121,6 +124,7 @@ async def register_orphanage(full: OrphanageFullRegister):
             status=OrphanageStatus.PENDING,
         )
         await orphanage.insert()
+        invalidate_orphanage(orphanage.id)
     except Exception as e:
         # Rollback user if orphanage creation fails
         try:
@@ -129,11 +133,11 @@ async def register_orphanage(full: OrphanageFullRegister):
             pass
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Failed to create orphanage: {str(e)}")
 
-    # Send welcome email (non-blocking)
+    # Queue welcome email (delivered by the email worker)
     try:
         await send_welcome_email(user.email, user.full_name, user.role.value)
     except Exception as e:
-        print(f"Warning: Failed to send welcome email: {str(e)}")
+        print(f"Warning: Failed to queue welcome email: {str(e)}")
 
     # Issue token
     access_token = create_access_token(
@@ -176,7 +180,7 @@ async def login(credentials: UserLogin):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -192,6 +196,9 @@ async def login(credentials: UserLogin):
     # Update last login
     from datetime import datetime
     user.last_login = datetime.utcnow()
+    # Migrate hashes made at another cost while the plain password is at hand
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(credentials.password)
     await user.save()
     
     # Create access token
@@ -220,14 +227,12 @@ async def login(credentials: UserLogin):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(token_data: Dict = Depends(get_current_user_token)):
+async def get_current_user(user: Optional[User] = Depends(get_authenticated_user)):
     """
     Get current authenticated user information
     
     Requires valid JWT token in Authorization header
     """
-    user_id = token_data.get("sub")
-    user = await User.get(user_id)
     
     if not user:
         raise HTTPException(
@@ -268,15 +273,17 @@ async def change_password(
         )
     
     # Verify old password
-    if not verify_password(password_data.old_password, user.hashed_password):
+    if not await verify_password_async(password_data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    user.hashed_password = hash_password(password_data.new_password)
+    user.hashed_password = await hash_password_async(password_data.new_password)
+    user.version += 1
     await user.save()
+    invalidate_user(user.id)
     
     return {"message": "Password changed successfully"}
 
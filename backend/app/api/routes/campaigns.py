@@ -2,15 +2,22 @@
 Campaign Routes
 Campaign creation, management, and browsing
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from typing import Dict, List, Optional
 from beanie import PydanticObjectId
 from datetime import datetime
 
 from app.models.campaign import Campaign, CampaignStatus, CampaignCategory
-from enum import Enum
 from app.models.orphanage import Orphanage, OrphanageStatus
+from app.models.read_models import campaign_list_pipeline, campaign_list_row
 from app.core.security import get_current_user_token
+from app.core.dependencies import get_current_orphanage
+from app.core.cache import cached_response, invalidate_campaign
+from app.core.singleflight import single_flight
+from app.utils.pagination import keyset_filter, set_next_cursor
+from app.utils.stats import increment_stats
+from app.utils.counters import apply_pending_counters, counters_sharded, pending_campaign_counters
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
@@ -22,14 +29,14 @@ async def create_campaign(
     category: CampaignCategory | str,
     target_amount: float,
     end_date: Optional[datetime] = None,
-    token_data: Dict = Depends(get_current_user_token)
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
 ):
     """Create a new campaign (orphanage role only)"""
     if token_data.get("role") != "orphanage":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Orphanage role required")
     
     user_id = token_data.get("sub")
-    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     
     # Ensure orphanage exists and is verified (handle Enum safely)
     if not orphanage:
@@ -60,6 +67,8 @@ async def create_campaign(
             approved_by=str(user_id),
         )
         await campaign.insert()
+        await increment_stats({"active_campaigns": 1}, orphanage_id=orphanage.id)
+        invalidate_campaign(campaign.id)
         return {"id": str(campaign.id), "message": "Campaign created successfully"}
     except Exception as e:
         # Surface detailed error to client for debugging during development
@@ -68,15 +77,18 @@ async def create_campaign(
 
 @router.get("/")
 async def list_campaigns(
+    response: Response,
     status: Optional[CampaignStatus] = None,
     category: Optional[CampaignCategory] = None,
     orphanage_id: Optional[str] = None,
-    limit: int = Query(default=20, le=100),
-    skip: int = Query(default=0, ge=0)
+    limit: int = Query(default=20, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None
 ):
     """List campaigns with filters
 
     Optional orphanage_id filter enables showing campaigns on a specific orphanage's public profile.
+    Pass the X-Next-Cursor header of a previous page as `cursor` for keyset paging (skip is then ignored).
     """
     # Build expression-based filters to avoid enum/link serialization pitfalls
     expr = None
@@ -91,71 +103,45 @@ async def list_campaigns(
         cond = (Campaign.orphanage.id == PydanticObjectId(orphanage_id))
         expr = cond if expr is None else (expr & cond)
 
-    campaigns = await Campaign.find(expr or {}).skip(skip).limit(limit).to_list()
-    
-    result = []
-    for c in campaigns:
-        await c.fetch_link(Campaign.orphanage)
-        result.append({
-            "id": str(c.id),
-            "title": c.title,
-            "description": c.description,
-            "category": c.category.value if isinstance(c.category, Enum) else c.category,
-            "target_amount": c.target_amount,
-            "raised_amount": c.raised_amount,
-            "status": c.status.value if isinstance(c.status, Enum) else c.status,
-            "orphanage_name": c.orphanage.name if c.orphanage else None,
-            "orphanage_id": str(c.orphanage.id) if c.orphanage else None,
-            "created_at": c.created_at.isoformat()
-        })
-    
-    return result
+    rows = await Campaign.find(expr or {}, keyset_filter(cursor, "created_at")).aggregate(
+        campaign_list_pipeline(0 if cursor else skip, limit)
+    ).to_list()
+    set_next_cursor(response, rows, "created_at", limit)
+    return [campaign_list_row(r) for r in rows]
 
 
 @router.get("/public/active")
+@single_flight("campaigns")
+@cached_response("campaigns", ttl=15)
 async def list_public_active_campaigns(
-    limit: int = Query(default=20, le=100),
-    skip: int = Query(default=0, ge=0)
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None
 ):
     """Public: List active campaigns only (no auth required).
 
     Uses Beanie field comparisons to avoid enum serialization pitfalls and returns
     normalized primitive values to the client.
     """
-    campaigns = (
-        await Campaign
-        .find(Campaign.status == CampaignStatus.ACTIVE)
-        .skip(skip)
-        .limit(limit)
-        .to_list()
-    )
-
-    result = []
-    for c in campaigns:
-        await c.fetch_link(Campaign.orphanage)
-        result.append({
-            "id": str(c.id),
-            "title": c.title,
-            "description": c.description,
-            "category": getattr(c.category, "value", c.category),
-            "target_amount": c.target_amount,
-            "raised_amount": c.raised_amount,
-            "status": getattr(c.status, "value", c.status),
-            "orphanage_name": c.orphanage.name if c.orphanage else None,
-            "orphanage_id": str(c.orphanage.id) if c.orphanage else None,
-            "created_at": c.created_at.isoformat(),
-        })
-    return result
+    rows = await Campaign.find(
+        Campaign.status == CampaignStatus.ACTIVE, keyset_filter(cursor, "created_at")
+    ).aggregate(
+        campaign_list_pipeline(0 if cursor else skip, limit)
+    ).to_list()
+    set_next_cursor(response, rows, "created_at", limit)
+    return [campaign_list_row(r) for r in rows]
 
 
 @router.get("/my")
-async def list_my_campaigns(token_data: Dict = Depends(get_current_user_token)):
+async def list_my_campaigns(
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
+):
     """List campaigns belonging to the current orphanage user"""
     if token_data.get("role") != "orphanage":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Orphanage role required")
 
-    user_id = token_data.get("sub")
-    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     if not orphanage:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orphanage not found")
 
@@ -178,16 +164,72 @@ async def list_my_campaigns(token_data: Dict = Depends(get_current_user_token)):
     ]
 
 
+def _campaign_etag(updated_at, status, raised_amount, disbursed_amount, total_donors, orphanage_updated_at) -> str:
+    """ETag over updated_at, the counters that change via $inc without touching it, and the embedded orphanage"""
+    return make_etag(
+        updated_at, getattr(status, "value", status), raised_amount, disbursed_amount, total_donors, orphanage_updated_at
+    )
+
+
+async def _current_campaign_etag(campaign_id: str) -> Optional[str]:
+    """Compute the current ETag from a small projection (no Document, no orphanage join)"""
+    if not PydanticObjectId.is_valid(campaign_id):
+        return None
+    oid = PydanticObjectId(campaign_id)
+    raw = await Campaign.get_motor_collection().find_one(
+        {"_id": oid},
+        {"updated_at": 1, "status": 1, "raised_amount": 1, "disbursed_amount": 1, "total_donors": 1, "orphanage": 1}
+    )
+    if not raw:
+        return None
+    orphanage_ref = getattr(raw.get("orphanage"), "id", None)
+    orphanage_raw = await Orphanage.get_motor_collection().find_one(
+        {"_id": orphanage_ref}, {"updated_at": 1}
+    ) if orphanage_ref is not None else None
+    raised_amount, total_donors = raw.get("raised_amount", 0.0), raw.get("total_donors", 0)
+    if counters_sharded():
+        pending_raised, pending_donors = await pending_campaign_counters(oid)
+        raised_amount += pending_raised
+        total_donors += pending_donors
+    return _campaign_etag(
+        raw.get("updated_at"), raw.get("status"), raised_amount, raw.get("disbursed_amount", 0.0), total_donors,
+        orphanage_raw.get("updated_at") if orphanage_raw else None,
+    )
+
+
 @router.get("/{campaign_id}")
-async def get_campaign(campaign_id: str):
-    """Get campaign details"""
+async def get_campaign(campaign_id: str, request: Request, response: Response):
+    """Get campaign details
+
+    Sends a strong ETag; a matching If-None-Match is answered with 304 before the body is built.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = await _current_campaign_etag(campaign_id)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
+    body, etag = await _campaign_detail(campaign_id=campaign_id)
+    response.headers["ETag"] = etag
+    return body
+
+
+@single_flight("campaign")
+@cached_response("campaign", ttl=10)
+async def _campaign_detail(campaign_id: str):
+    """Build the campaign detail payload and its ETag"""
     campaign = await Campaign.get(campaign_id)
     
     if not campaign:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     
     await campaign.fetch_link(Campaign.orphanage)
+    await apply_pending_counters(campaign)
     
+    etag = _campaign_etag(
+        campaign.updated_at, campaign.status, campaign.raised_amount, campaign.disbursed_amount, campaign.total_donors,
+        campaign.orphanage.updated_at if campaign.orphanage else None,
+    )
     return {
         "id": str(campaign.id),
         "title": campaign.title,
@@ -206,7 +248,7 @@ async def get_campaign(campaign_id: str):
         } if campaign.orphanage else None,
         "total_donors": campaign.total_donors,
         "created_at": campaign.created_at.isoformat()
-    }
+    }, etag
 
 
 @router.put("/{campaign_id}")
@@ -215,7 +257,7 @@ async def update_campaign(
     title: Optional[str] = None,
     description: Optional[str] = None,
     target_amount: Optional[float] = None,
-    token_data: Dict = Depends(get_current_user_token)
+    owner_orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
 ):
     """Update campaign (owner only)"""
     campaign = await Campaign.get(campaign_id)
@@ -224,9 +266,7 @@ async def update_campaign(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     
     await campaign.fetch_link(Campaign.orphanage)
-    user_id = token_data.get("sub")
-    # Fetch the current user's orphanage and compare IDs to avoid dereferencing nested Link objects
-    owner_orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
+    # Compare against the current user's orphanage IDs to avoid dereferencing nested Link objects
     if not owner_orphanage or str(campaign.orphanage.id) != str(owner_orphanage.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
@@ -239,6 +279,7 @@ async def update_campaign(
     
     campaign.updated_at = datetime.utcnow()
     await campaign.save()
+    invalidate_campaign(campaign.id)
     
     return {"message": "Campaign updated successfully"}
 
@@ -246,7 +287,8 @@ async def update_campaign(
 @router.delete("/{campaign_id}")
 async def delete_campaign(
     campaign_id: str,
-    token_data: Dict = Depends(get_current_user_token)
+    token_data: Dict = Depends(get_current_user_token),
+    owner_orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
 ):
     """Delete campaign (owner only)"""
     campaign = await Campaign.get(campaign_id)
@@ -255,12 +297,13 @@ async def delete_campaign(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     
     await campaign.fetch_link(Campaign.orphanage)
-    user_id = token_data.get("sub")
     # Compare orphanage ownership without accessing nested Link fields
-    owner_orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     if (not owner_orphanage or str(campaign.orphanage.id) != str(owner_orphanage.id)) and token_data.get("role") != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
     await campaign.delete()
+    invalidate_campaign(campaign.id)
+    if campaign.status == CampaignStatus.ACTIVE:
+        await increment_stats({"active_campaigns": -1}, orphanage_id=campaign.orphanage.id)
     
     return {"message": "Campaign deleted successfully"}
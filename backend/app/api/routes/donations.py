@@ -2,47 +2,49 @@
 Donation Routes
 Donation creation, Razorpay integration, and webhooks
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Request, Header
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Header, Query, Response
 from typing import Dict, Optional
-from datetime import datetime
-import uuid
 
 from app.models.donation import Donation, DonationStatus
 from app.models.campaign import Campaign
-from app.models.user import User
-from app.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.core.security import get_current_user_token
+from app.core.dependencies import get_user
+from app.core.idempotency import idempotent
 from app.utils.razorpay import create_payment_order, verify_payment_signature, verify_webhook_signature
-from app.utils.email import send_donation_confirmation_email
+from app.utils.links import resolve_links
+from app.utils.stats import increment_stats
+from app.utils.payments import CampaignNotFound, CompletionInProgress, complete_donation, fail_donation
+from app.utils.webhooks import HANDLED_EVENTS, enqueue_webhook, webhook_event_id
+from app.utils.concurrency import gather_limited
+from app.utils.pagination import keyset_filter, set_next_cursor
 
 router = APIRouter()
 
 
 @router.post("/create-order")
+@idempotent("donations.create_order")
 async def create_donation_order(
     campaign_id: str,
     amount: float,
     is_anonymous: bool = False,
     message: Optional[str] = None,
-    token_data: Dict = Depends(get_current_user_token)
+    token_data: Dict = Depends(get_current_user_token),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Create Razorpay order for donation"""
-    # Get campaign
-    campaign = await Campaign.get(campaign_id)
+    """Create Razorpay order for donation (retry-safe with an Idempotency-Key header)"""
+    # Get campaign and user concurrently
+    user_id = token_data.get("sub")
+    campaign, user = await gather_limited(Campaign.get(campaign_id), get_user(user_id))
     if not campaign or campaign.status != "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Campaign not available")
     
-    # Get user
-    user_id = token_data.get("sub")
-    user = await User.get(user_id)
-    
     # Create Razorpay order
     notes = {
         "campaign_id": campaign_id,
         "donor_id": user_id,
         "donor_email": user.email
     }
-    order = create_payment_order(amount=amount, notes=notes)
+    order = await create_payment_order(amount=amount, notes=notes)
     
     # Create donation record
     donation = Donation(
@@ -58,6 +60,7 @@ async def create_donation_order(
         status=DonationStatus.INITIATED
     )
     await donation.insert()
+    await increment_stats({}, platform_deltas={f"donations_by_status.{DonationStatus.INITIATED.value}": 1})
     
     return {
         "order_id": order["id"],
@@ -68,14 +71,16 @@ async def create_donation_order(
 
 
 @router.post("/verify-payment")
+@idempotent("donations.verify_payment")
 async def verify_donation_payment(
     donation_id: str,
     razorpay_order_id: str,
     razorpay_payment_id: str,
     razorpay_signature: str,
-    token_data: Dict = Depends(get_current_user_token)
+    token_data: Dict = Depends(get_current_user_token),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Verify payment after Razorpay checkout"""
+    """Verify payment after Razorpay checkout (retry-safe with an Idempotency-Key header)"""
     donation = await Donation.get(donation_id)
     
     if not donation:
@@ -85,52 +90,24 @@ async def verify_donation_payment(
     is_valid = verify_payment_signature(razorpay_order_id, razorpay_payment_id, razorpay_signature)
     
     if not is_valid:
-        donation.status = DonationStatus.FAILED
-        await donation.save()
+        await fail_donation(donation)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payment verification failed")
     
-    # Update donation
-    donation.razorpay_payment_id = razorpay_payment_id
-    donation.razorpay_signature = razorpay_signature
-    donation.status = DonationStatus.COMPLETED
-    donation.transaction_date = datetime.utcnow()
-    await donation.save()
-    
-    # Update campaign raised amount
-    await donation.fetch_link(Donation.campaign)
-    campaign = donation.campaign
-    campaign.raised_amount += donation.amount
-    campaign.total_donors += 1
-    await campaign.save()
-    
-    # Create transaction record
-    transaction = Transaction(
-        transaction_id=f"TXN{uuid.uuid4().hex[:12].upper()}",
-        transaction_type=TransactionType.DONATION,
-        amount=donation.amount,
-        status=TransactionStatus.COMPLETED,
-        campaign=campaign,
-        orphanage=campaign.orphanage,
-        donor=donation.donor,
-        donation=donation,
-        payment_gateway="razorpay",
-        gateway_transaction_id=razorpay_payment_id,
-        gateway_order_id=razorpay_order_id,
-        description=f"Donation to {campaign.title}"
-    )
-    await transaction.insert()
-    
-    # Send confirmation email
+    # Completes once even if the payment.captured webhook got there first
     try:
-        await send_donation_confirmation_email(
-            donor_email=donation.donor_email,
-            donor_name=donation.donor_name,
-            campaign_title=campaign.title,
-            amount=donation.amount,
-            transaction_id=transaction.transaction_id
-        )
-    except Exception as e:
-        print(f"Failed to send confirmation email: {str(e)}")
+        transaction = await complete_donation(donation, razorpay_payment_id, razorpay_order_id, razorpay_signature)
+    except CampaignNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    except CompletionInProgress:
+        transaction = None
+    
+    if not transaction:
+        # The payment is confirmed; the concurrent webhook is still recording it
+        return {
+            "message": "Donation successful, processing",
+            "transaction_id": None,
+            "donation_id": str(donation.id)
+        }
     
     return {
         "message": "Donation successful",
@@ -140,18 +117,30 @@ async def verify_donation_payment(
 
 
 @router.get("/my-donations")
-async def get_my_donations(token_data: Dict = Depends(get_current_user_token)):
-    """Get current user's donations"""
+async def get_my_donations(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    token_data: Dict = Depends(get_current_user_token)
+):
+    """Get current user's donations
+
+    Newest first; supports skip or keyset paging via the X-Next-Cursor header.
+    """
     from beanie import PydanticObjectId
     
     user_id = token_data.get("sub")
     donations = await Donation.find(
-        Donation.donor.id == PydanticObjectId(user_id)
-    ).sort("-created_at").to_list()
+        Donation.donor.id == PydanticObjectId(user_id),
+        keyset_filter(cursor, "created_at"),
+    ).sort("-created_at", "-_id").skip(0 if cursor else skip).limit(limit).to_list()
+    set_next_cursor(response, donations, "created_at", limit)
     
+    await resolve_links(donations, "campaign")
+
     result = []
     for d in donations:
-        await d.fetch_link(Donation.campaign)
         result.append({
             "id": str(d.id),
             "amount": d.amount,
@@ -203,23 +192,26 @@ async def get_donation(
 @router.post("/webhook")
 async def razorpay_webhook(
     request: Request,
-    x_razorpay_signature: str = Header(None)
+    x_razorpay_signature: str = Header(None),
+    x_razorpay_event_id: Optional[str] = Header(None)
 ):
-    """Handle Razorpay webhooks"""
+    """Handle Razorpay webhooks
+
+    Verified events are stored in the webhook inbox (deduplicated by event ID) and
+    acknowledged at once; the webhook worker applies them in the background.
+    """
     body = await request.body()
     
     # Verify webhook signature
     if not verify_webhook_signature(body, x_razorpay_signature):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid signature")
     
-    # Process webhook event
     import json
     payload = json.loads(body)
     event = payload.get("event")
     
-    # Handle payment.captured event
-    if event == "payment.captured":
-        # TODO: Process payment captured event
-        pass
+    if event not in HANDLED_EVENTS:
+        return {"status": "ignored"}
     
-    return {"status": "ok"}
+    stored = await enqueue_webhook(webhook_event_id(x_razorpay_event_id, body), event, payload)
+    return {"status": "ok" if stored else "duplicate"}
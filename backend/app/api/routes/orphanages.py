@@ -2,15 +2,22 @@
 Orphanage Routes
 Orphanage registration, profile management, and verification
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response, UploadFile, File
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional
 from beanie import PydanticObjectId
 
 from app.models.orphanage import Orphanage, OrphanageStatus
-from app.models.user import User
+from app.models.read_models import ORPHANAGE_LIST_PROJECTION, find_rows, orphanage_list_row
 from app.schemas.orphanage import OrphanageCreate, OrphanageUpdate, OrphanageResponse
 from app.core.security import get_current_user_token, require_role
+from app.core.dependencies import get_current_orphanage, get_user
+from app.core.cache import cached_response, invalidate_orphanage
+from app.core.singleflight import single_flight
+from app.utils.pagination import keyset_filter, set_next_cursor
+from app.utils.stats import increment_stats
+from app.utils.concurrency import gather_limited
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 
 router = APIRouter()
@@ -34,10 +41,13 @@ async def register_orphanage(
         )
     
     user_id = token_data.get("sub")
-    user = await User.get(user_id)
+    user, existing, existing_reg = await gather_limited(
+        get_user(user_id),
+        Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id)),
+        Orphanage.find_one(Orphanage.registration_number == orphanage_data.registration_number),
+    )
     
     # Check if user already has an orphanage
-    existing = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,9 +55,6 @@ async def register_orphanage(
         )
     
     # Check if registration number is unique
-    existing_reg = await Orphanage.find_one(
-        Orphanage.registration_number == orphanage_data.registration_number
-    )
     if existing_reg:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -61,6 +68,7 @@ async def register_orphanage(
         status=OrphanageStatus.PENDING
     )
     await orphanage.insert()
+    invalidate_orphanage(orphanage.id)
     
     return OrphanageResponse(
         id=str(orphanage.id),
@@ -70,7 +78,10 @@ async def register_orphanage(
 
 
 @router.get("/my", response_model=OrphanageResponse)
-async def get_my_orphanage(token_data: Dict = Depends(get_current_user_token)):
+async def get_my_orphanage(
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
+):
     """Get current user's orphanage"""
     if token_data.get("role") != "orphanage":
         raise HTTPException(
@@ -78,9 +89,6 @@ async def get_my_orphanage(token_data: Dict = Depends(get_current_user_token)):
             detail="Only orphanage accounts can access this endpoint"
         )
     
-    user_id = token_data.get("sub")
-    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
-    
     if not orphanage:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,7 +102,10 @@ async def get_my_orphanage(token_data: Dict = Depends(get_current_user_token)):
     )
 
 @router.get("/my/summary")
-async def get_my_orphanage_summary(token_data: Dict = Depends(get_current_user_token)):
+async def get_my_orphanage_summary(
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
+):
     """Summary for current orphanage: stats, projects, recent donations, and documents"""
     if token_data.get("role") != "orphanage":
         raise HTTPException(
@@ -102,18 +113,16 @@ async def get_my_orphanage_summary(token_data: Dict = Depends(get_current_user_t
             detail="Only orphanage accounts can access this endpoint"
         )
 
-    user_id = token_data.get("sub")
-    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     if not orphanage:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orphanage not found")
 
-    # Campaigns
+    # Campaigns and reports are independent; load them concurrently
     from app.models.campaign import Campaign
-    campaigns = await Campaign.find(Campaign.orphanage.id == orphanage.id).to_list()
-
-    # Reports
     from app.models.report import Report
-    reports = await Report.find(Report.orphanage.id == orphanage.id).to_list()
+    campaigns, reports = await gather_limited(
+        Campaign.find(Campaign.orphanage.id == orphanage.id).to_list(),
+        Report.find(Report.orphanage.id == orphanage.id).to_list(),
+    )
 
     # Donations via Donation model filtered by campaigns
     from app.models.donation import Donation
@@ -184,24 +193,34 @@ async def get_my_orphanage_summary(token_data: Dict = Depends(get_current_user_t
 
 
 @router.get("/my/payouts")
-async def get_my_payouts(token_data: Dict = Depends(get_current_user_token)):
-    """List payout (disbursement) transactions for the current orphanage"""
+async def get_my_payouts(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
+):
+    """List payout (disbursement) transactions for the current orphanage
+
+    Newest first; supports skip or keyset paging via the X-Next-Cursor header.
+    """
     if token_data.get("role") != "orphanage":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only orphanage accounts can access this endpoint"
         )
 
-    user_id = token_data.get("sub")
-    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
     if not orphanage:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orphanage not found")
 
     from app.models.transaction import Transaction, TransactionType
-    payouts = await Transaction.find({
-        "orphanage": orphanage.id,
-        "transaction_type": TransactionType.DISBURSEMENT,
-    }).sort("-transaction_date").to_list()
+    payouts = await Transaction.find(
+        Transaction.orphanage.id == orphanage.id,
+        Transaction.transaction_type == TransactionType.DISBURSEMENT,
+        keyset_filter(cursor, "transaction_date"),
+    ).sort("-transaction_date", "-_id").skip(0 if cursor else skip).limit(limit).to_list()
+    set_next_cursor(response, payouts, "transaction_date", limit)
 
     return [
         {
@@ -218,12 +237,38 @@ async def get_my_payouts(token_data: Dict = Depends(get_current_user_token)):
     ]
 
 
+def _orphanage_etag(updated_at, status, verified_at) -> str:
+    """ETag over updated_at plus verification fields (set without touching updated_at)"""
+    return make_etag(updated_at, getattr(status, "value", status), verified_at)
+
+
 @router.get("/{orphanage_id}", response_model=OrphanageResponse)
-async def get_orphanage(orphanage_id: str):
+async def get_orphanage(orphanage_id: str, request: Request, response: Response):
     """Get orphanage by ID (public)
 
     Note: Declared after '/my/*' routes to avoid path conflicts where '/my' could be treated as an ID.
+    Sends a strong ETag; a matching If-None-Match is answered with 304 before the body is built.
     """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and PydanticObjectId.is_valid(orphanage_id):
+        raw = await Orphanage.get_motor_collection().find_one(
+            {"_id": PydanticObjectId(orphanage_id)},
+            {"updated_at": 1, "status": 1, "verified_at": 1}
+        )
+        if raw:
+            etag = _orphanage_etag(raw.get("updated_at"), raw.get("status"), raw.get("verified_at"))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    body, etag = await _orphanage_detail(orphanage_id=orphanage_id)
+    response.headers["ETag"] = etag
+    return body
+
+
+@single_flight("orphanage")
+@cached_response("orphanage", ttl=60)
+async def _orphanage_detail(orphanage_id: str):
+    """Build the public orphanage profile and its ETag"""
     orphanage = await Orphanage.get(orphanage_id)
 
     if not orphanage:
@@ -236,7 +281,7 @@ async def get_orphanage(orphanage_id: str):
         id=str(orphanage.id),
         **orphanage.dict(exclude={"id", "user", "verified_by"}),
         created_at=orphanage.created_at.isoformat()
-    )
+    ), _orphanage_etag(orphanage.updated_at, orphanage.status, orphanage.verified_at)
 
 
 @router.post("/upload-logo")
@@ -268,12 +313,16 @@ async def upload_logo(file: UploadFile = File(...), token_data: Dict = Depends(g
 
 # Note: Avoid strict response_model validation here to tolerate legacy/bad data during development
 @router.get("/")
+@single_flight("orphanages")
+@cached_response("orphanages", ttl=30)
 async def list_orphanages(
+    response: Response,
     status: Optional[OrphanageStatus] = None,
     city: Optional[str] = None,
     state: Optional[str] = None,
-    limit: int = Query(default=20, le=100),
-    skip: int = Query(default=0, ge=0)
+    limit: int = Query(default=20, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None
 ):
     """
     List orphanages with optional filters
@@ -281,6 +330,7 @@ async def list_orphanages(
     - **status**: Filter by verification status
     - **city**: Filter by city
     - **state**: Filter by state
+    - **cursor**: X-Next-Cursor header of a previous page (keyset paging; skip is ignored)
     """
     query = {}
     
@@ -292,28 +342,17 @@ async def list_orphanages(
         query["state"] = state
     
     # Always show latest first so newly registered appear at the top
-    orphanages = (
-        await Orphanage
-        .find(query)
-        .sort("-created_at")
-        .skip(skip)
-        .limit(limit)
-        .to_list()
+    # Raw projected rows: no Document construction for list views
+    rows = await find_rows(
+        Orphanage,
+        {**query, **keyset_filter(cursor, "created_at")},
+        ORPHANAGE_LIST_PROJECTION,
+        sort=[("created_at", -1), ("_id", -1)],
+        skip=0 if cursor else skip,
+        limit=limit,
     )
-    
-    results = []
-    for o in orphanages:
-        data = o.dict(exclude={"id", "user", "verified_by"})
-        data["id"] = str(o.id)
-        data["created_at"] = o.created_at.isoformat() if getattr(o, "created_at", None) else None
-        # Ensure status is the raw enum value (e.g., 'pending', 'verified')
-        try:
-            enum_status = getattr(o, "status", None)
-            data["status"] = enum_status.value if hasattr(enum_status, "value") else str(enum_status)
-        except Exception:
-            data["status"] = str(getattr(o, "status", ""))
-        results.append(data)
-    return results
+    set_next_cursor(response, rows, "created_at", limit)
+    return [orphanage_list_row(r) for r in rows]
 
 
 @router.put("/{orphanage_id}", response_model=OrphanageResponse)
@@ -352,7 +391,9 @@ async def update_orphanage(
     
     from datetime import datetime
     orphanage.updated_at = datetime.utcnow()
+    orphanage.version += 1
     await orphanage.save()
+    invalidate_orphanage(orphanage.id)
     
     return OrphanageResponse(
         id=str(orphanage.id),
@@ -390,5 +431,8 @@ async def delete_orphanage(
         )
     
     await orphanage.delete()
+    invalidate_orphanage(orphanage.id)
+    if orphanage.status == OrphanageStatus.VERIFIED:
+        await increment_stats({}, platform_deltas={"verified_orphanages": -1})
     
     return {"message": "Orphanage deleted successfully"}
@@ -2,14 +2,26 @@
 Report Routes
 Utilization reports submission and verification
 """
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response, UploadFile, File
 from typing import Dict, List, Optional
 from datetime import datetime
+from beanie import PydanticObjectId
 
 from app.models.report import Report, ReportStatus, ReportType
 from app.models.campaign import Campaign
 from app.models.orphanage import Orphanage
+from app.models.read_models import (
+    CAMPAIGN_REPORT_PROJECTION,
+    campaign_report_row,
+    find_rows,
+    public_report_pipeline,
+    public_report_row,
+)
 from app.core.security import get_current_user_token
+from app.core.dependencies import get_current_orphanage
+from app.core.cache import cached_response, invalidate_reports
+from app.utils.pagination import keyset_filter, set_next_cursor
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
@@ -57,36 +69,47 @@ async def submit_report(
         status=ReportStatus.SUBMITTED
     )
     await report.insert()
+    invalidate_reports()
     
     return {"id": str(report.id), "message": "Report submitted successfully"}
 
 
 @router.get("/campaign/{campaign_id}")
-async def get_campaign_reports(campaign_id: str):
-    """Get reports for a campaign"""
-    campaign = await Campaign.get(campaign_id)
+async def get_campaign_reports(campaign_id: str, request: Request, response: Response):
+    """Get reports for a campaign
+
+    Sends a strong ETag (report count + latest updated_at); a matching If-None-Match
+    is answered with 304 before the list is built.
+    """
+    # Existence check by _id only, so a 304 never loads the campaign document
+    campaign = await Campaign.get_motor_collection().find_one(
+        {"_id": PydanticObjectId(campaign_id)}, {"_id": 1}
+    ) if PydanticObjectId.is_valid(campaign_id) else None
     if not campaign:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    
-    from beanie import PydanticObjectId
-    reports = await Report.find(
-        Report.campaign.id == PydanticObjectId(campaign_id)
-    ).sort("-submitted_at").to_list()
-    
-    result = []
-    for r in reports:
-        result.append({
-            "id": str(r.id),
-            "title": r.title,
-            "report_type": r.report_type,
-            "amount_utilized": r.amount_utilized,
-            "beneficiaries_count": r.beneficiaries_count,
-            "status": r.status,
-            "submitted_at": r.submitted_at.isoformat(),
-            "verified_at": r.verified_at.isoformat() if r.verified_at else None
-        })
-    
-    return result
+    campaign_oid = campaign["_id"]
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        versions = await Report.aggregate([
+            {"$match": {"campaign.$id": campaign_oid}},
+            {"$group": {"_id": None, "count": {"$sum": 1}, "latest": {"$max": "$updated_at"}}},
+        ]).to_list()
+        version = versions[0] if versions else {"count": 0, "latest": None}
+        etag = make_etag(version["count"], version["latest"])
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
+    rows = await find_rows(
+        Report,
+        {"campaign.$id": campaign_oid},
+        CAMPAIGN_REPORT_PROJECTION,
+        sort=[("submitted_at", -1)],
+    )
+    # Same version as the $max above, which skips reports without updated_at
+    latest = max((r["updated_at"] for r in rows if r.get("updated_at") is not None), default=None)
+    response.headers["ETag"] = make_etag(len(rows), latest)
+    return [campaign_report_row(r) for r in rows]
 
 
 @router.get("/{report_id}")
@@ -146,18 +169,28 @@ async def verify_report(
     report.verified_at = datetime.utcnow()
     report.verification_notes = verification_notes
     report.rejection_reason = rejection_reason
+    report.updated_at = datetime.utcnow()
     
     await report.save()
+    invalidate_reports()
     
     return {"message": "Report verified successfully"}
 
 
 @router.get("/")
 async def list_reports(
+    response: Response,
     status: Optional[ReportStatus] = None,
-    token_data: Dict = Depends(get_current_user_token)
+    limit: int = Query(default=100, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    token_data: Dict = Depends(get_current_user_token),
+    orphanage: Optional[Orphanage] = Depends(get_current_orphanage)
 ):
-    """List reports (admin sees all, orphanage sees own)"""
+    """List reports (admin sees all, orphanage sees own)
+
+    Newest first; supports skip or keyset paging via the X-Next-Cursor header.
+    """
     query = {}
     
     if status:
@@ -165,13 +198,13 @@ async def list_reports(
     
     # If orphanage, filter by their orphanage
     if token_data.get("role") == "orphanage":
-        from beanie import PydanticObjectId
-        user_id = token_data.get("sub")
-        orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
         if orphanage:
-            query["orphanage"] = orphanage.id
+            query["orphanage.$id"] = orphanage.id
     
-    reports = await Report.find(query).sort("-submitted_at").to_list()
+    reports = await Report.find(
+        query, keyset_filter(cursor, "submitted_at")
+    ).sort("-submitted_at", "-_id").skip(0 if cursor else skip).limit(limit).to_list()
+    set_next_cursor(response, reports, "submitted_at", limit)
     
     result = []
     for r in reports:
@@ -188,38 +221,10 @@ async def list_reports(
 
 
 @router.get("/public/recent")
-async def list_recent_public_reports(limit: int = 6):
+@cached_response("reports", ttl=60)
+async def list_recent_public_reports(limit: int = Query(default=6, ge=1, le=50)):
     """Public: list recent verified reports to showcase activities/impact on donor dashboard"""
-    reports = (
-        await Report
-        .find({"status": ReportStatus.VERIFIED})
-        .sort("-submitted_at")
-        .limit(limit)
-        .to_list()
-    )
-
-    result = []
-    for r in reports:
-        try:
-            await r.fetch_link(Report.campaign)
-            await r.fetch_link(Report.orphanage)
-        except Exception:
-            pass
-        result.append({
-            "id": str(r.id),
-            "title": r.title,
-            "report_type": r.report_type,
-            "amount_utilized": r.amount_utilized,
-            "beneficiaries_count": r.beneficiaries_count,
-            "submitted_at": r.submitted_at.isoformat() if r.submitted_at else None,
-            "orphanage": {
-                "id": str(r.orphanage.id) if getattr(r, "orphanage", None) else None,
-                "name": getattr(getattr(r, "orphanage", None), "name", None),
-                "city": getattr(getattr(r, "orphanage", None), "city", None),
-            },
-            "campaign": {
-                "id": str(r.campaign.id) if getattr(r, "campaign", None) else None,
-                "title": getattr(getattr(r, "campaign", None), "title", None),
-            },
-        })
-    return result
+    rows = await Report.find(Report.status == ReportStatus.VERIFIED).aggregate(
+        public_report_pipeline(limit)
+    ).to_list()
+    return [public_report_row(r) for r in rows]
@@ -8,7 +8,9 @@ from pydantic import BaseModel
 import os
 
 from app.models.user import User
-from app.core.security import get_current_user_token, hash_password
+from app.core.security import get_current_user_token
+from app.core.cache import invalidate_user
+from app.core.dependencies import get_authenticated_user
 from app.schemas.auth import UserResponse
 
 
@@ -16,10 +18,8 @@ router = APIRouter()
 
 
 @router.get("/profile", response_model=UserResponse)
-async def get_profile(token_data: Dict = Depends(get_current_user_token)):
+async def get_profile(user: Optional[User] = Depends(get_authenticated_user)):
     """Get current user profile"""
-    user_id = token_data.get("sub")
-    user = await User.get(user_id)
     
     if not user:
         raise HTTPException(
@@ -68,7 +68,9 @@ async def update_profile(
     
     from datetime import datetime
     user.updated_at = datetime.utcnow()
+    user.version += 1
     await user.save()
+    invalidate_user(user.id)
     
     return {"message": "Profile updated successfully"}
 
@@ -110,7 +112,9 @@ async def upload_profile_image(
     user.profile_image = public_url
     from datetime import datetime as dt
     user.updated_at = dt.utcnow()
+    user.version += 1
     await user.save()
+    invalidate_user(user.id)
 
     return {"url": public_url}
 
@@ -121,7 +125,7 @@ async def delete_account(
     token_data: Dict = Depends(get_current_user_token)
 ):
     """Delete user account (requires password confirmation)"""
-    from app.core.security import verify_password
+    from app.core.security import verify_password_async
     
     user_id = token_data.get("sub")
     user = await User.get(user_id)
@@ -133,7 +137,7 @@ async def delete_account(
         )
     
     # Verify password
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
@@ -141,6 +145,8 @@ async def delete_account(
     
     # Soft delete (deactivate)
     user.is_active = False
+    user.version += 1
     await user.save()
+    invalidate_user(user.id)
     
     return {"message": "Account deleted successfully"}
@@ -3,7 +3,7 @@ Application bootstrap helpers
  - Ensure default admin user exists based on environment variables
 """
 from app.models.user import User, UserRole
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password_async, verify_password_async
 from app.core.config import settings
 
 
@@ -37,13 +37,13 @@ async def ensure_admin_user() -> None:
             updated = True
         # Ensure password matches ADMIN_PASSWORD; if not, reset it
         try:
-            if admin_password and not verify_password(admin_password, existing.hashed_password):
-                existing.hashed_password = hash_password(admin_password)
+            if admin_password and not await verify_password_async(admin_password, existing.hashed_password):
+                existing.hashed_password = await hash_password_async(admin_password)
                 updated = True
         except Exception:
             # If verification fails for any reason, set to ADMIN_PASSWORD
             if admin_password:
-                existing.hashed_password = hash_password(admin_password)
+                existing.hashed_password = await hash_password_async(admin_password)
                 updated = True
         if updated:
             await existing.save()
@@ -53,7 +53,7 @@ async def ensure_admin_user() -> None:
         return
 
     # Create new admin user
-    hashed_pwd = hash_password(admin_password)
+    hashed_pwd = await hash_password_async(admin_password)
     admin_user = User(
         email=admin_email,
         hashed_password=hashed_pwd,
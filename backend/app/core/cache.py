@@ -0,0 +1,212 @@
+"""
+Response Cache
+In-process TTL + LRU cache for public read endpoints, with invalidation hooks
+
+Each uvicorn worker holds its own cache, so invalidation is local to the worker
+that handled the write; the per-route TTL bounds staleness on the others.
+"""
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return False, None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def remove_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every key matching predicate; returns the number removed"""
+        keys = [k for k in self._data if predicate(k)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def remove_values_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop every entry whose value matches predicate; returns the number removed"""
+        keys = [k for k, (_, v) in self._data.items() if predicate(v)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    """Namespaced response cache; keys are (namespace, sorted handler params)"""
+
+    def __init__(self, maxsize: int, default_ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=default_ttl)
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> Tuple:
+        return (namespace, tuple(sorted(params.items())))
+
+    def get(self, namespace: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        hit, value = self._cache.get(self.make_key(namespace, params))
+        counters = self._namespace_stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+        return hit, value
+
+    def set(self, namespace: str, params: Dict[str, Any], value: Any, ttl: float) -> None:
+        self._cache.set(self.make_key(namespace, params), value, ttl)
+
+    def invalidate(self, namespace: str, **params: Any) -> int:
+        """Drop a namespace, or only its entries whose params include all given items"""
+        def matches(key: Tuple) -> bool:
+            if key[0] != namespace:
+                return False
+            key_params = dict(key[1])
+            return all(key_params.get(k) == v for k, v in params.items())
+        return self._cache.remove_where(matches)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "namespaces": self._namespace_stats}
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    default_ttl=settings.RESPONSE_CACHE_DEFAULT_TTL,
+)
+
+# user id -> that user's Orphanage document (see app.core.dependencies)
+orphanage_by_user = TTLCache(
+    maxsize=settings.ORPHANAGE_CACHE_MAX_ENTRIES,
+    ttl=settings.ORPHANAGE_CACHE_TTL,
+)
+
+# user id -> UserCacheEntry (see app.core.dependencies.get_user)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL,
+)
+
+
+def cached_response(namespace: str, ttl: float) -> Callable:
+    """
+    Decorator caching a route handler's return value per distinct query/path params
+
+    Headers the handler sets on an injected `Response` (e.g. X-Next-Cursor) are
+    cached with the body and replayed on hits. Exceptions are never cached.
+
+    Usage:
+        @router.get("/public/active")
+        @cached_response("campaigns", ttl=15)
+        async def list_public_active_campaigns(response: Response, ...): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+
+            response = next((v for v in kwargs.values() if isinstance(v, Response)), None)
+            params = {k: v for k, v in kwargs.items() if not isinstance(v, Response)}
+
+            hit, cached = response_cache.get(namespace, params)
+            if hit:
+                value, headers = cached
+                if response is not None:
+                    response.headers.update(headers)
+                return value
+
+            before = set(response.headers.keys()) if response is not None else set()
+            value = await func(*args, **kwargs)
+            headers = {
+                k: v for k, v in response.headers.items() if k not in before
+            } if response is not None else {}
+            response_cache.set(namespace, params, (value, headers), ttl)
+            return value
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Invalidation hooks (called from write paths)
+# ---------------------------------------------------------------------------
+
+def invalidate_campaign(campaign_id: Any = None) -> None:
+    """A campaign changed (amounts, status, details): drop its detail page and all campaign lists"""
+    if campaign_id is None:
+        response_cache.invalidate("campaign")
+    else:
+        response_cache.invalidate("campaign", campaign_id=str(campaign_id))
+    response_cache.invalidate("campaigns")
+
+
+def invalidate_orphanage(orphanage_id: Any = None) -> None:
+    """An orphanage changed: drop its profile, owner mapping, orphanage lists and lists showing its name"""
+    if orphanage_id is None:
+        response_cache.invalidate("orphanage")
+        orphanage_by_user.clear()
+    else:
+        response_cache.invalidate("orphanage", orphanage_id=str(orphanage_id))
+        orphanage_by_user.remove_values_where(lambda e: str(e.orphanage.id) == str(orphanage_id))
+    response_cache.invalidate("orphanages")
+    response_cache.invalidate("campaigns")
+    response_cache.invalidate("reports")
+
+
+def invalidate_reports() -> None:
+    """A report was submitted or (re)verified"""
+    response_cache.invalidate("reports")
+
+
+def invalidate_user(user_id: Any = None) -> None:
+    """A user's profile, password or status changed (callers also bump User.version for other workers)"""
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(str(user_id))
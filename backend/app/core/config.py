@@ -31,11 +31,48 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    JWT_BACKEND: str = "jose"  # jose | pyjwt (pip install PyJWT)
+    JWT_DECODE_CACHE_SIZE: int = 4096  # verified tokens kept per worker; 0 disables
+    JWT_DECODE_CACHE_MAX_TTL: float = 300.0
     
     # Razorpay
     RAZORPAY_KEY_ID: str
     RAZORPAY_KEY_SECRET: str
     RAZORPAY_WEBHOOK_SECRET: str
+    RAZORPAY_API_BASE: str = "https://api.razorpay.com/v1"
+    RAZORPAY_TIMEOUT_SECONDS: float = 10.0
+    RAZORPAY_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    RAZORPAY_MAX_CONNECTIONS: int = 20
+    RAZORPAY_MAX_RETRIES: int = 3
+    RAZORPAY_RETRY_BACKOFF_SECONDS: float = 0.25
+    
+    # Abandoned checkout sweeper (INITIATED donations older than the window are checked, then archived)
+    # Off by default: it archives live payment data, so enable it deliberately
+    DONATION_SWEEP_ENABLED: bool = False
+    DONATION_ABANDON_AFTER_MINUTES: int = 1440
+    DONATION_SWEEP_INTERVAL_SECONDS: float = 900.0
+    DONATION_SWEEP_BATCH_SIZE: int = 100
+    DONATION_SWEEP_CONCURRENCY: int = 8
+    DONATION_SWEEP_RECHECK_MINUTES: int = 60  # delay before a kept donation is checked again
+    
+    # Scheduled payment reconciliation (trailing window of gateway payments vs donations)
+    RECONCILE_ENABLED: bool = False
+    RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    RECONCILE_WINDOW_HOURS: float = 24.0
+    RECONCILE_CONCURRENCY: int = 8
+    
+    # Idempotency-Key replay window (stored responses expire via a TTL index)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCAL_CACHE_SIZE: int = 1024
+    # An in-progress key whose request has not finished after this long can be taken over by a retry
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0
+    
+    # Webhook inbox worker
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 2.0
+    WEBHOOK_LEASE_SECONDS: float = 60.0
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_RETRY_BACKOFF_SECONDS: float = 5.0
     
     # Email
     SMTP_HOST: str
@@ -44,12 +81,48 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str
     SMTP_FROM_EMAIL: str
     SMTP_FROM_NAME: str = "Heart-Chain"
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Persistent SMTP sessions per worker (reused until idle or after max messages)
+    SMTP_POOL_SIZE: int = 4
+    SMTP_SESSION_IDLE_SECONDS: float = 60.0
+    SMTP_SESSION_MAX_MESSAGES: int = 100
+    # Email outbox worker (handlers queue messages; the worker delivers them)
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 300.0
+    EMAIL_MAX_ATTEMPTS: int = 6
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 30.0
     
     # File Upload
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 5242880  # 5MB
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "pdf"]
     
+    # Response cache (in-process, per worker)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_DEFAULT_TTL: float = 30.0
+    
+    # Current-user orphanage resolver cache (per worker; revalidated against Orphanage.version)
+    ORPHANAGE_CACHE_MAX_ENTRIES: int = 2048
+    ORPHANAGE_CACHE_TTL: float = 60.0
+    ORPHANAGE_CACHE_REVALIDATE_AFTER: float = 5.0
+    
+    # Authenticated user cache (per worker; revalidated against User.version)
+    USER_CACHE_MAX_ENTRIES: int = 4096
+    USER_CACHE_TTL: float = 300.0
+    USER_CACHE_REVALIDATE_AFTER: float = 5.0
+    
+    # Campaign counters (0 shards = update the campaign document directly)
+    CAMPAIGN_COUNTER_SHARDS: int = 0
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    
+    # Password hashing (dedicated bcrypt thread pool; 0 max queue = unbounded)
+    # Cost factor: each +1 doubles hash time; calibrate with python -m app.core.password_calibration
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    
     # Admin
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
@@ -59,6 +132,9 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_URL: str = "http://localhost:5173"
     
+    # Diagnostics
+    INDEX_ADVISOR_ON_STARTUP: bool = False
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -13,12 +13,24 @@ from app.models.campaign import Campaign
 from app.models.donation import Donation
 from app.models.report import Report
 from app.models.transaction import Transaction
+from app.models.stats import PlatformStats
+from app.models.counter import CampaignCounterShard
+from app.models.webhook_event import WebhookEvent
+from app.models.idempotency import IdempotencyRecord
+from app.models.email_outbox import OutboxEmail
 
 
 # Global database client
 db_client = None
 
 
+async def _drop_outdated_indexes(database) -> None:
+    """Drop indexes whose options changed, so init_beanie can create the new definition"""
+    transactions = await database["transactions"].index_information()
+    if "transaction_id_1" in transactions and not transactions["transaction_id_1"].get("unique"):
+        await database["transactions"].drop_index("transaction_id_1")
+
+
 async def init_db():
     """Initialize database connection and Beanie ODM"""
     global db_client
@@ -26,6 +38,8 @@ async def init_db():
     # Create Motor client
     db_client = AsyncIOMotorClient(settings.MONGODB_URL)
     
+    await _drop_outdated_indexes(db_client[settings.DATABASE_NAME])
+    
     # Initialize Beanie with document models
     await init_beanie(
         database=db_client[settings.DATABASE_NAME],
@@ -35,7 +49,12 @@ async def init_db():
             Campaign,
             Donation,
             Report,
-            Transaction
+            Transaction,
+            PlatformStats,
+            CampaignCounterShard,
+            WebhookEvent,
+            IdempotencyRecord,
+            OutboxEmail
         ]
     )
     
@@ -0,0 +1,124 @@
+"""
+Route Dependencies
+Per-request resolvers shared by route handlers
+"""
+import time
+from typing import Any, Dict, Optional
+
+from beanie import PydanticObjectId
+from fastapi import Depends
+
+from app.core.cache import orphanage_by_user, user_cache
+from app.core.config import settings
+from app.core.security import get_current_user_token
+from app.core.singleflight import single_flight
+from app.models.orphanage import Orphanage
+from app.models.user import User
+
+
+class UserCacheEntry:
+    """Cached user plus the last time its version stamp was confirmed"""
+    __slots__ = ("user", "checked_at")
+
+    def __init__(self, user: User):
+        self.user = user
+        self.checked_at = time.monotonic()
+
+
+@single_flight("user")
+async def _load_user(user_id: str) -> Optional[User]:
+    user = await User.get(user_id)
+    if user is not None:
+        user_cache.set(user_id, UserCacheEntry(user))
+    return user
+
+
+async def _version_current(entry: UserCacheEntry) -> bool:
+    """Check the cached copy against the stored version stamp (an _id lookup returning one field)"""
+    raw = await User.get_motor_collection().find_one({"_id": entry.user.id}, {"version": 1})
+    return raw is not None and raw.get("version", 0) == entry.user.version
+
+
+async def get_user(user_id: str) -> Optional[User]:
+    """
+    Load a user through the per-worker user cache
+
+    Entries younger than USER_CACHE_REVALIDATE_AFTER are served as is; older
+    ones are revalidated against User.version, so a profile, password or
+    status change made by any worker is picked up on the next check. Write
+    paths should keep using User.get() so they never save a stale copy.
+
+    Returns:
+        A private copy of the user, or None if it does not exist
+    """
+    hit, entry = user_cache.get(user_id)
+    if hit and time.monotonic() - entry.checked_at >= settings.USER_CACHE_REVALIDATE_AFTER:
+        if await _version_current(entry):
+            entry.checked_at = time.monotonic()
+        else:
+            user_cache.pop(user_id)
+            hit = False
+    user = entry.user if hit else await _load_user(user_id=user_id)
+    return user.model_copy() if user is not None else None
+
+
+async def get_authenticated_user(
+    token_data: Dict[str, Any] = Depends(get_current_user_token)
+) -> Optional[User]:
+    """Dependency resolving the current user's document through get_user()"""
+    return await get_user(token_data.get("sub"))
+
+
+class OrphanageCacheEntry:
+    """Cached orphanage plus the last time its version stamp was confirmed"""
+    __slots__ = ("orphanage", "checked_at")
+
+    def __init__(self, orphanage: Orphanage):
+        self.orphanage = orphanage
+        self.checked_at = time.monotonic()
+
+
+@single_flight("orphanage_by_user")
+async def _load_orphanage_for_user(user_id: str) -> Optional[Orphanage]:
+    orphanage = await Orphanage.find_one(Orphanage.user.id == PydanticObjectId(user_id))
+    # Only positive results are cached, so a newly registered orphanage is seen immediately
+    if orphanage is not None:
+        orphanage_by_user.set(user_id, OrphanageCacheEntry(orphanage))
+    return orphanage
+
+
+async def _orphanage_version_current(entry: OrphanageCacheEntry) -> bool:
+    """Check the cached copy against the stored version stamp; False once it was deleted"""
+    raw = await Orphanage.get_motor_collection().find_one({"_id": entry.orphanage.id}, {"version": 1})
+    return raw is not None and raw.get("version", 0) == entry.orphanage.version
+
+
+async def get_current_orphanage(
+    token_data: Dict[str, Any] = Depends(get_current_user_token)
+) -> Optional[Orphanage]:
+    """
+    Dependency resolving the orphanage owned by the current user
+
+    Cached per worker by user id (ORPHANAGE_CACHE_TTL) and evicted by
+    invalidate_orphanage() in the worker making a change. Entries older than
+    ORPHANAGE_CACHE_REVALIDATE_AFTER are checked against Orphanage.version,
+    so verification, edits and deletion on other workers are seen too.
+
+    Returns:
+        The user's Orphanage (a private copy), or None for non-orphanage
+        users and users without a registered orphanage
+    """
+    if token_data.get("role") != "orphanage":
+        return None
+
+    user_id = token_data.get("sub")
+    hit, entry = orphanage_by_user.get(user_id)
+    if hit and time.monotonic() - entry.checked_at >= settings.ORPHANAGE_CACHE_REVALIDATE_AFTER:
+        if await _orphanage_version_current(entry):
+            entry.checked_at = time.monotonic()
+        else:
+            orphanage_by_user.pop(user_id)
+            hit = False
+    orphanage = entry.orphanage if hit else await _load_orphanage_for_user(user_id=user_id)
+    # Handlers get their own copy so the cached document is never mutated in place
+    return orphanage.model_copy() if orphanage is not None else None
@@ -0,0 +1,139 @@
+"""
+Idempotency Keys
+Replay the stored response for retried POSTs that carry an Idempotency-Key header
+
+The first request with a key reserves it in the TTL-indexed idempotency_keys
+collection, runs, and stores its response. Retries with the same key (same user
+and route) get that response back without running the handler again. Recent
+completed keys are also kept in a per-worker cache so replays skip the database.
+"""
+import functools
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import DuplicateKeyError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.idempotency import IdempotencyRecord, IdempotencyStatus
+
+
+# Kwargs that identify the caller/key rather than the operation
+_NON_FINGERPRINT_PARAMS = {"idempotency_key", "token_data"}
+
+completed_keys = TTLCache(
+    maxsize=settings.IDEMPOTENCY_LOCAL_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+
+
+def _fingerprint(params: Dict[str, Any]) -> str:
+    return hashlib.sha256(repr(sorted(params.items())).encode("utf-8")).hexdigest()
+
+
+def _replay(record_fingerprint: str, fingerprint: str, response: Any) -> Any:
+    if record_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with different parameters"
+        )
+    return response
+
+
+def idempotent(namespace: str) -> Callable:
+    """
+    Decorator making a POST handler safe to retry with an Idempotency-Key header
+
+    The handler must declare `idempotency_key` (the header) and `token_data`
+    (keys are scoped per user). Without a key the handler runs as usual.
+    A key whose first request is still running gets 409; a handler error
+    releases the key so the client can retry, and a key left in progress for
+    longer than IDEMPOTENCY_LOCK_SECONDS (crashed worker) is taken over by the
+    next retry.
+
+    Usage:
+        @router.post("/create-order")
+        @idempotent("donations.create_order")
+        async def create_donation_order(
+            ...,
+            token_data: Dict = Depends(get_current_user_token),
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+        ): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            idempotency_key = kwargs.get("idempotency_key")
+            if not idempotency_key:
+                return await func(*args, **kwargs)
+
+            user_id = (kwargs.get("token_data") or {}).get("sub")
+            key = f"{namespace}:{user_id}:{idempotency_key}"
+            fingerprint = _fingerprint({
+                k: v for k, v in kwargs.items()
+                if k not in _NON_FINGERPRINT_PARAMS and not isinstance(v, (Request, Response))
+            })
+
+            hit, cached = completed_keys.get(key)
+            if hit:
+                return _replay(cached[0], fingerprint, cached[1])
+
+            now = datetime.utcnow()
+            lease = now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            # BSON dates keep milliseconds, and ownership is checked by matching the lease exactly
+            lease = lease.replace(microsecond=lease.microsecond // 1000 * 1000)
+            collection = IdempotencyRecord.get_motor_collection()
+            record = IdempotencyRecord(
+                key=key,
+                fingerprint=fingerprint,
+                locked_until=lease,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            )
+            try:
+                await record.insert()
+            except DuplicateKeyError:
+                existing = await IdempotencyRecord.find_one(IdempotencyRecord.key == key)
+                if existing is None:
+                    # Expired or released between the insert and the lookup; treat as a conflict to be safe
+                    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Please retry the request")
+                if existing.status == IdempotencyStatus.COMPLETED:
+                    completed_keys.set(key, (existing.fingerprint, existing.response))
+                    return _replay(existing.fingerprint, fingerprint, existing.response)
+                _replay(existing.fingerprint, fingerprint, None)
+                # Take over a key whose request died (crash, or its result was never stored)
+                taken = await collection.find_one_and_update(
+                    {
+                        "_id": existing.id,
+                        "status": IdempotencyStatus.IN_PROGRESS.value,
+                        "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}],
+                    },
+                    {"$set": {"locked_until": lease}},
+                )
+                if taken is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with this Idempotency-Key is still being processed"
+                    )
+                record = existing
+            # Only the holder of this lease may release or complete the key
+            owned = {"_id": record.id, "locked_until": lease}
+
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                await collection.delete_one(owned)
+                raise
+
+            stored = jsonable_encoder(result)
+            await collection.update_one(owned, {"$set": {
+                "status": IdempotencyStatus.COMPLETED.value,
+                "response": stored,
+                "locked_until": None,
+            }})
+            completed_keys.set(key, (fingerprint, stored))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,160 @@
+"""
+Index Advisor
+Explain each route's query shape and report collection scans and in-memory sorts
+
+Run from the backend directory:
+    python -m app.core.index_advisor
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Type
+
+from beanie import Document
+from bson import ObjectId
+
+from app.models.campaign import Campaign
+from app.models.donation import Donation
+from app.models.orphanage import Orphanage
+from app.models.report import Report
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.webhook_event import WebhookEvent
+from app.models.email_outbox import OutboxEmail
+
+
+# Stages that indicate a missing or unusable index
+PROBLEM_STAGES = {"COLLSCAN", "SORT"}
+
+
+class QueryShape(NamedTuple):
+    """A representative query issued by a route handler"""
+    name: str
+    model: Type[Document]
+    filter: Dict[str, Any]
+    sort: Optional[List] = None
+
+
+def _keyset(field: str) -> Dict:
+    """Sample keyset continuation filter (see app.utils.pagination)"""
+    now, oid = datetime.utcnow(), ObjectId()
+    return {"$or": [{field: {"$lt": now}}, {field: now, "_id": {"$lt": oid}}]}
+
+
+def query_shapes() -> List[QueryShape]:
+    """Query shapes of the list and lookup routes, with placeholder values"""
+    oid = ObjectId()
+    newest = [("created_at", -1), ("_id", -1)]
+    newest_reports = [("submitted_at", -1), ("_id", -1)]
+    return [
+        QueryShape("campaigns.list", Campaign, {}, newest),
+        QueryShape("campaigns.list.cursor", Campaign, _keyset("created_at"), newest),
+        QueryShape("campaigns.public_active", Campaign, {"status": "active"}, newest),
+        QueryShape("campaigns.by_orphanage", Campaign, {"orphanage.$id": oid}, newest),
+        QueryShape("orphanages.list", Orphanage, {}, newest),
+        QueryShape("orphanages.by_status", Orphanage, {"status": "verified"}, newest),
+        QueryShape("orphanages.for_user", Orphanage, {"user.$id": oid}),
+        QueryShape("donations.my_donations", Donation, {"donor.$id": oid}, newest),
+        QueryShape("donations.recent_for_campaigns", Donation, {"campaign.$id": {"$in": [oid]}}, [("created_at", -1)]),
+        QueryShape("donations.by_order", Donation, {"razorpay_order_id": "order_sample"}),
+        QueryShape("donations.by_payment", Donation, {"razorpay_payment_id": "pay_sample"}),
+        QueryShape(
+            "donations.abandoned_sweep",
+            Donation,
+            {"status": "initiated", "created_at": {"$lt": datetime.utcnow()}},
+            [("created_at", 1)],
+        ),
+        QueryShape("reports.list", Report, {}, newest_reports),
+        QueryShape("reports.by_status", Report, {"status": "verified"}, newest_reports),
+        QueryShape("reports.by_orphanage", Report, {"orphanage.$id": oid}, newest_reports),
+        QueryShape("reports.by_campaign", Report, {"campaign.$id": oid}, [("submitted_at", -1)]),
+        QueryShape(
+            "transactions.payouts",
+            Transaction,
+            {"orphanage.$id": oid, "transaction_type": "disbursement"},
+            [("transaction_date", -1), ("_id", -1)],
+        ),
+        QueryShape("users.by_email", User, {"email": "sample@example.com"}),
+        QueryShape(
+            "webhook_inbox.claim",
+            WebhookEvent,
+            {"status": {"$in": ["pending", "processing"]}, "$or": [{"locked_until": None}, {"locked_until": {"$lt": datetime.utcnow()}}]},
+            [("received_at", 1)],
+        ),
+        QueryShape(
+            "email_outbox.claim",
+            OutboxEmail,
+            {"status": {"$in": ["pending", "sending"]}, "$or": [{"locked_until": None}, {"locked_until": {"$lt": datetime.utcnow()}}]},
+            [("created_at", 1)],
+        ),
+    ]
+
+
+def _plan_stages(plan: Dict) -> Set[str]:
+    """Collect stage names from an explain() plan tree"""
+    stages = set()
+    stack = [plan.get("queryPlan", plan)]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.add(node["stage"])
+        if "inputStage" in node:
+            stack.append(node["inputStage"])
+        stack.extend(node.get("inputStages", []))
+    return stages
+
+
+async def explain_shape(shape: QueryShape) -> Dict[str, Any]:
+    """Explain one query shape and flag problem stages in its winning plan"""
+    cursor = shape.model.get_motor_collection().find(shape.filter)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    explained = await cursor.explain()
+    stages = _plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+    return {
+        "name": shape.name,
+        "collection": shape.model.Settings.name,
+        "stages": sorted(stages),
+        "problems": sorted(stages & PROBLEM_STAGES),
+    }
+
+
+async def run_index_advisor(verbose: bool = False) -> List[Dict[str, Any]]:
+    """
+    Explain every known query shape and print a report
+
+    Requires an initialized database (init_db). Returns the findings that
+    contain a COLLSCAN or in-memory SORT stage.
+    """
+    findings = []
+    for shape in query_shapes():
+        try:
+            result = await explain_shape(shape)
+        except Exception as e:
+            print(f"⚠️  Index advisor could not explain {shape.name}: {e}")
+            continue
+        if result["problems"]:
+            findings.append(result)
+            print(f"❌ {result['name']} ({result['collection']}): {', '.join(result['problems'])} (plan: {', '.join(result['stages'])})")
+        elif verbose:
+            print(f"✅ {result['name']} ({result['collection']}): {', '.join(result['stages'])}")
+    if not findings:
+        print("✅ Index advisor: all query shapes use indexes")
+    return findings
+
+
+async def _main() -> int:
+    from app.core.database import init_db, close_db
+
+    await init_db()
+    try:
+        findings = await run_index_advisor(verbose=True)
+    finally:
+        await close_db()
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,68 @@
+"""
+JWT Backends
+Interchangeable JWT encode/decode implementations selected by JWT_BACKEND
+
+python-jose is the default (it is in requirements.txt); PyJWT is used when
+JWT_BACKEND=pyjwt and the package is installed. Both raise InvalidToken for
+bad signatures, malformed tokens and expired tokens.
+"""
+from typing import Any, Dict, List
+
+
+class InvalidToken(Exception):
+    """Token failed decoding or verification"""
+
+
+class JoseBackend:
+    """python-jose"""
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwt
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, payload: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as e:
+            raise InvalidToken(str(e)) from e
+
+
+class PyJWTBackend:
+    """PyJWT (optional dependency: pip install PyJWT)"""
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+        self._jwt = jwt
+
+    def encode(self, payload: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.PyJWTError as e:
+            raise InvalidToken(str(e)) from e
+
+
+BACKENDS = {backend.name: backend for backend in (JoseBackend, PyJWTBackend)}
+
+
+def get_backend(name: str):
+    """
+    Instantiate a JWT backend by name
+
+    Raises:
+        ValueError: Unknown backend name
+        ImportError: Backend library not installed
+    """
+    try:
+        backend_cls = BACKENDS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown JWT_BACKEND '{name}' (choose from: {', '.join(BACKENDS)})")
+    return backend_cls()
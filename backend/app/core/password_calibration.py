@@ -0,0 +1,74 @@
+"""
+Password Hash Calibration
+Measure bcrypt hash time per cost factor on this machine and suggest BCRYPT_ROUNDS
+
+Run from the backend directory:
+    python -m app.core.password_calibration --target-ms 250 --logins-per-second 20
+"""
+import argparse
+import math
+import time
+from typing import Dict, List
+
+import bcrypt
+
+from app.core.config import settings
+
+
+def time_cost(rounds: int, samples: int = 3) -> float:
+    """Median seconds for one bcrypt hash at the given cost"""
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(min_rounds: int, max_rounds: int, samples: int = 3) -> List[Dict[str, float]]:
+    """Hash timings for each cost in [min_rounds, max_rounds]"""
+    results = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        seconds = time_cost(rounds, samples)
+        results.append({
+            "rounds": rounds,
+            "ms_per_hash": seconds * 1000,
+            "hashes_per_s_per_worker": 1 / seconds,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure bcrypt cost factors and suggest BCRYPT_ROUNDS")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Upper bound for one hash")
+    parser.add_argument("--logins-per-second", type=float, default=0.0, help="Expected peak login rate (per worker process)")
+    args = parser.parse_args()
+
+    workers = settings.PASSWORD_HASH_WORKERS
+    print(f"Current BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}, PASSWORD_HASH_WORKERS={workers}")
+    print(f"{'rounds':>6} {'ms/hash':>9} {'logins/s (pool)':>16}" + (f" {'cores busy':>11}" if args.logins_per_second else ""))
+
+    suggested = None
+    for row in calibrate(args.min_rounds, args.max_rounds, args.samples):
+        line = f"{row['rounds']:>6} {row['ms_per_hash']:>9.1f} {row['hashes_per_s_per_worker'] * workers:>16.1f}"
+        if args.logins_per_second:
+            line += f" {args.logins_per_second * row['ms_per_hash'] / 1000:>11.2f}"
+        print(line)
+        if row["ms_per_hash"] <= args.target_ms:
+            suggested = row
+
+    if suggested is None:
+        print(f"No cost in range hashes within {args.target_ms:.0f} ms; lower --min-rounds")
+        return
+    print(f"Suggested BCRYPT_ROUNDS={suggested['rounds']} (highest cost within {args.target_ms:.0f} ms per hash)")
+    if args.logins_per_second:
+        needed = math.ceil(args.logins_per_second * suggested["ms_per_hash"] / 1000)
+        print(f"At {args.logins_per_second:g} logins/s that keeps about {needed} bcrypt worker(s) busy")
+
+
+if __name__ == "__main__":
+    main()
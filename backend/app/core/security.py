@@ -2,25 +2,42 @@
 Security Utilities
 JWT token creation, verification, and password hashing
 """
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
 import bcrypt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.jwt_backends import InvalidToken, get_backend
+from app.utils.concurrency import BoundedExecutor, ExecutorSaturated
 
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# JWT implementation (JWT_BACKEND) and verified-token cache: token -> claims, never past the token's exp
+jwt_backend = get_backend(settings.JWT_BACKEND)
+token_cache = TTLCache(
+    maxsize=settings.JWT_DECODE_CACHE_SIZE,
+    ttl=settings.JWT_DECODE_CACHE_MAX_TTL,
+)
+
+# bcrypt runs here, never on the event loop (see hash_password_async / verify_password_async)
+password_executor = BoundedExecutor(
+    "bcrypt",
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
 
 def hash_password(password: str) -> str:
-    """Hash a plain text password"""
+    """Hash a plain text password (cost factor from BCRYPT_ROUNDS)"""
     # Convert password to bytes and hash it
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string for storage
     return hashed.decode('utf-8')
@@ -36,6 +53,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def bcrypt_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor encoded in a bcrypt hash ("$2b$12$..." -> 12), None if unparseable"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a cost other than BCRYPT_ROUNDS"""
+    return bcrypt_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+async def _run_password_task(fn, *args):
+    try:
+        return await password_executor.run(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bounded bcrypt pool (use from async code)"""
+    return await _run_password_task(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded bcrypt pool (use from async code)"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
@@ -55,7 +106,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt_backend.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
 
@@ -64,6 +115,9 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify JWT token
     
+    Tokens verified earlier are served from token_cache until the sooner of
+    their exp and JWT_DECODE_CACHE_MAX_TTL, skipping the signature check.
+    
     Args:
         token: JWT token string
     
@@ -73,15 +127,23 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    if settings.JWT_DECODE_CACHE_SIZE:
+        hit, claims = token_cache.get(token)
+        if hit:
+            return dict(claims)
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+        payload = jwt_backend.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except InvalidToken:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    remaining = payload.get("exp", 0) - time.time()
+    if settings.JWT_DECODE_CACHE_SIZE and remaining > 0:
+        token_cache.set(token, dict(payload), ttl=min(remaining, settings.JWT_DECODE_CACHE_MAX_TTL))
+    return payload
 
 
 async def get_current_user_token(
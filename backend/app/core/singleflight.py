@@ -0,0 +1,85 @@
+"""
+Single-Flight
+Coalesce concurrent identical reads so they share one in-flight call
+
+Scope is one worker's event loop: concurrent callers with the same key await the
+same task instead of each issuing their own database queries.
+"""
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from fastapi import Request, Response
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by (namespace, params)"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        The call runs in its own task, so a caller that disconnects (and is
+        cancelled) does not cancel the result for the others. Exceptions are
+        raised to every waiter.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": self.inflight, "calls": self.calls, "coalesced": self.coalesced}
+
+
+single_flight_group = SingleFlight()
+
+
+def single_flight(namespace: str) -> Callable:
+    """
+    Decorator coalescing concurrent calls with identical keyword params
+
+    Works on route handlers and on cached resolvers. Injected `Request`/`Response`
+    objects are excluded from the key; headers the leading call sets on its
+    `Response` (e.g. X-Next-Cursor) are copied to every coalesced caller's.
+
+    Usage:
+        @single_flight("campaign")
+        @cached_response("campaign", ttl=10)
+        async def _campaign_detail(campaign_id: str): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            response = next((v for v in kwargs.values() if isinstance(v, Response)), None)
+            params = {k: v for k, v in kwargs.items() if not isinstance(v, (Request, Response))}
+            key = (namespace, args, tuple(sorted(params.items())))
+
+            async def call() -> Tuple[Any, Dict[str, str]]:
+                before = set(response.headers.keys()) if response is not None else set()
+                value = await func(*args, **kwargs)
+                headers = {
+                    k: v for k, v in response.headers.items() if k not in before
+                } if response is not None else {}
+                return value, headers
+
+            value, headers = await single_flight_group.do(key, call)
+            if response is not None:
+                response.headers.update(headers)
+            return value
+        return wrapper
+    return decorator
@@ -3,6 +3,7 @@ Campaign Model
 Represents funding campaigns created by orphanages
 """
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field
 from typing import Optional, List
 from datetime import datetime
@@ -71,7 +72,17 @@ class Campaign(Document):
     
     class Settings:
         name = "campaigns"
-        indexes = ["title", "status", "category", "orphanage"]
+        indexes = [
+            "title",
+            "status",
+            "category",
+            "orphanage",
+            # Keyset paging for newest-first listings (see app.utils.pagination)
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # An orphanage's campaigns, newest first
+            IndexModel([("orphanage.$id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
     
     class Config:
         json_schema_extra = {
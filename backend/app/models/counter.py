@@ -0,0 +1,27 @@
+"""
+Counter Shard Model
+Pending campaign counter increments, folded into Campaign periodically
+"""
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+from datetime import datetime
+
+
+class CampaignCounterShard(Document):
+    """One of N shards absorbing raised_amount/total_donors increments for a campaign"""
+    
+    campaign_id: PydanticObjectId
+    shard: int
+    
+    # Pending (not yet folded) deltas
+    raised_amount: float = 0.0
+    total_donors: int = 0
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "campaign_counter_shards"
+        indexes = [
+            IndexModel([("campaign_id", ASCENDING), ("shard", ASCENDING)], unique=True),
+        ]
@@ -3,8 +3,9 @@ Donation Model
 Represents donations made by donors to campaigns
 """
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -55,6 +56,14 @@ class Donation(Document):
     # Status
     status: DonationStatus = DonationStatus.INITIATED
     
+    # Completion side effects (see app.utils.payments.apply_completion_effects)
+    side_effects_applied: bool = True  # set False when the donation completes, True once all steps ran
+    effects_done: List[str] = Field(default_factory=list)
+    effects_locked_until: Optional[datetime] = None
+    completed_from: Optional[str] = None  # status before COMPLETED, for the per-status stats
+    refund_effects_done: List[str] = Field(default_factory=list)  # "<refund_id>:<step>" (see refund_donation)
+    sweep_next_check_at: Optional[datetime] = None  # set when the abandoned-checkout sweep keeps it
+    
     # Metadata
     is_anonymous: bool = False
     message: Optional[str] = None  # Message from donor
@@ -68,7 +77,24 @@ class Donation(Document):
     
     class Settings:
         name = "donations"
-        indexes = ["donor", "campaign", "status", "razorpay_order_id"]
+        indexes = [
+            "donor",
+            "campaign",
+            "status",
+            "razorpay_order_id",
+            "razorpay_payment_id",
+            # Keyset paging for a donor's history (see app.utils.pagination)
+            IndexModel([("donor.$id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Abandoned-checkout sweep: oldest INITIATED first
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+            # Completions whose side effects are unfinished (re-driven by reconciliation)
+            IndexModel(
+                [("side_effects_applied", ASCENDING)],
+                partialFilterExpression={"side_effects_applied": False},
+            ),
+            # Recent donations to a set of campaigns
+            IndexModel([("campaign.$id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
     
     class Config:
         json_schema_extra = {
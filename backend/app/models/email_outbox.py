@@ -0,0 +1,49 @@
+"""
+Email Outbox Model
+Queued outgoing emails, delivered asynchronously by the email worker
+"""
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+
+# Sent messages are kept this long for troubleshooting, then removed by MongoDB
+SENT_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class OutboxStatus(str, Enum):
+    """Delivery state of an outbox entry"""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"  # permanent SMTP error, or gave up after EMAIL_MAX_ATTEMPTS
+
+
+class OutboxEmail(Document):
+    """One rendered email waiting for (or done with) SMTP delivery"""
+
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    last_error: Optional[str] = None
+    # Lease while SENDING, next retry time while PENDING
+    locked_until: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+    class Settings:
+        name = "email_outbox"
+        indexes = [
+            # Worker claim query and queue depth/age: oldest due entry first
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+            # Only set once sent, so pending and dead entries never expire
+            IndexModel([("sent_at", ASCENDING)], expireAfterSeconds=SENT_RETENTION_SECONDS),
+        ]
@@ -0,0 +1,37 @@
+"""
+Idempotency Record Model
+Stored responses for requests sent with an Idempotency-Key header
+"""
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+from typing import Any, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class IdempotencyStatus(str, Enum):
+    """Whether the first request with a key has finished"""
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
+class IdempotencyRecord(Document):
+    """First response for a (route, user, Idempotency-Key); MongoDB removes it after expires_at"""
+
+    key: str  # "<namespace>:<user id>:<Idempotency-Key>"
+    fingerprint: str  # hash of the request params; a reused key with other params is rejected
+    status: IdempotencyStatus = IdempotencyStatus.IN_PROGRESS
+    response: Optional[Any] = None
+    # Lease of the request running under this key; a retry may take over once it passes
+    locked_until: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "idempotency_keys"
+        indexes = [
+            IndexModel([("key", ASCENDING)], unique=True),
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        ]
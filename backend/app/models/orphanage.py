@@ -3,6 +3,7 @@ Orphanage Model
 Represents orphanage organizations
 """
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field, EmailStr
 from typing import Optional, List
 from datetime import datetime
@@ -62,9 +63,21 @@ class Orphanage(Document):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # Bumped on profile/status changes; lets cached copies be revalidated cheaply
+    version: int = 0
+    
     class Settings:
         name = "orphanages"
-        indexes = ["name", "status", "registration_number"]
+        indexes = [
+            "name",
+            "status",
+            "registration_number",
+            # Keyset paging for newest-first listings (see app.utils.pagination)
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Owner lookup (orphanage for the current user)
+            IndexModel([("user.$id", ASCENDING)]),
+        ]
     
     class Config:
         json_schema_extra = {
@@ -0,0 +1,289 @@
+"""
+Read Models
+Compact rows for list endpoints, read with raw Motor cursors and projections
+
+Public list views only need a handful of fields, so they skip Beanie Document
+construction and Pydantic validation entirely and decode raw BSON into TypedDicts.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type, TypedDict
+
+from beanie import Document
+
+from app.models.campaign import Campaign
+from app.models.orphanage import Orphanage, OrphanageStatus
+
+
+def _iso(value: Any) -> Optional[str]:
+    """ISO format for datetimes, None otherwise"""
+    return value.isoformat() if value is not None else None
+
+
+def _str_id(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Campaigns
+# ---------------------------------------------------------------------------
+
+class CampaignListRow(TypedDict):
+    """Campaign card in list/grid views"""
+    id: str
+    title: str
+    description: str
+    category: str
+    target_amount: float
+    raised_amount: float
+    status: str
+    orphanage_name: Optional[str]
+    orphanage_id: Optional[str]
+    created_at: Optional[str]
+
+
+def campaign_list_pipeline(skip: int, limit: int) -> List[Dict]:
+    """Aggregation stages for campaign list views (appended after the $match).
+
+    Sorts newest first and pages before the join, then fetches only the orphanage
+    name server-side so a page costs a single round trip instead of one extra
+    fetch_link per campaign.
+    """
+    return [
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": Orphanage.Settings.name,
+            "localField": "orphanage.$id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"name": 1}}],
+            "as": "orphanage",
+        }},
+        {"$unwind": {"path": "$orphanage", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "title": 1,
+            "description": 1,
+            "category": 1,
+            "target_amount": 1,
+            "raised_amount": 1,
+            "status": 1,
+            "created_at": 1,
+            "orphanage_id": "$orphanage._id",
+            "orphanage_name": "$orphanage.name",
+        }},
+    ]
+
+
+def campaign_list_row(raw: Dict) -> CampaignListRow:
+    """Decode a raw campaign_list_pipeline row"""
+    return CampaignListRow(
+        id=str(raw["_id"]),
+        title=raw.get("title"),
+        description=raw.get("description"),
+        category=raw.get("category"),
+        target_amount=raw.get("target_amount"),
+        raised_amount=raw.get("raised_amount", 0.0),
+        status=raw.get("status"),
+        orphanage_name=raw.get("orphanage_name"),
+        orphanage_id=_str_id(raw.get("orphanage_id")),
+        created_at=_iso(raw.get("created_at")),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Orphanages
+# ---------------------------------------------------------------------------
+
+class OrphanageListRow(TypedDict):
+    """Orphanage card in list views (same fields as the public profile)"""
+    id: str
+    name: str
+    registration_number: str
+    description: str
+    email: str
+    phone: str
+    website: Optional[str]
+    address: str
+    city: str
+    state: str
+    pincode: str
+    country: str
+    status: str
+    verification_documents: List[str]
+    verified_at: Optional[datetime]
+    rejection_reason: Optional[str]
+    capacity: int
+    current_occupancy: int
+    established_year: Optional[int]
+    logo: Optional[str]
+    images: List[str]
+    created_at: Optional[str]
+    updated_at: Optional[datetime]
+    version: int
+
+
+# Everything except owner/verifier links (same payload as the public profile)
+ORPHANAGE_LIST_PROJECTION = {"user": 0, "verified_by": 0, "revision_id": 0}
+
+
+def orphanage_list_row(raw: Dict) -> OrphanageListRow:
+    """Decode a raw orphanage document (projected with ORPHANAGE_LIST_PROJECTION)
+
+    Defaults match the Orphanage model for fields missing from older documents;
+    list defaults are built per row so rows never share a mutable value.
+    """
+    return OrphanageListRow(
+        id=str(raw["_id"]),
+        name=raw.get("name"),
+        registration_number=raw.get("registration_number"),
+        description=raw.get("description"),
+        email=raw.get("email"),
+        phone=raw.get("phone"),
+        website=raw.get("website"),
+        address=raw.get("address"),
+        city=raw.get("city"),
+        state=raw.get("state"),
+        pincode=raw.get("pincode"),
+        country=raw.get("country", "India"),
+        status=raw.get("status", OrphanageStatus.PENDING.value),
+        verification_documents=raw.get("verification_documents") or [],
+        verified_at=raw.get("verified_at"),
+        rejection_reason=raw.get("rejection_reason"),
+        capacity=raw.get("capacity"),
+        current_occupancy=raw.get("current_occupancy", 0),
+        established_year=raw.get("established_year"),
+        logo=raw.get("logo"),
+        images=raw.get("images") or [],
+        created_at=_iso(raw.get("created_at")),
+        updated_at=raw.get("updated_at"),
+        version=raw.get("version", 0),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+class CampaignReportRow(TypedDict):
+    """Report entry on a campaign page"""
+    id: str
+    title: str
+    report_type: str
+    amount_utilized: float
+    beneficiaries_count: int
+    status: str
+    submitted_at: Optional[str]
+    verified_at: Optional[str]
+
+
+CAMPAIGN_REPORT_PROJECTION = {
+    "title": 1,
+    "report_type": 1,
+    "amount_utilized": 1,
+    "beneficiaries_count": 1,
+    "status": 1,
+    "submitted_at": 1,
+    "verified_at": 1,
+    "updated_at": 1,
+}
+
+
+def campaign_report_row(raw: Dict) -> CampaignReportRow:
+    """Decode a raw report projected with CAMPAIGN_REPORT_PROJECTION"""
+    return CampaignReportRow(
+        id=str(raw["_id"]),
+        title=raw.get("title"),
+        report_type=raw.get("report_type"),
+        amount_utilized=raw.get("amount_utilized"),
+        beneficiaries_count=raw.get("beneficiaries_count"),
+        status=raw.get("status"),
+        submitted_at=_iso(raw.get("submitted_at")),
+        verified_at=_iso(raw.get("verified_at")),
+    )
+
+
+class PublicReportRow(TypedDict):
+    """Recent verified report showcased on public pages"""
+    id: str
+    title: str
+    report_type: str
+    amount_utilized: float
+    beneficiaries_count: int
+    submitted_at: Optional[str]
+    orphanage: Dict[str, Optional[str]]
+    campaign: Dict[str, Optional[str]]
+
+
+def public_report_pipeline(limit: int) -> List[Dict]:
+    """Aggregation stages for recent public reports with campaign/orphanage names joined"""
+    return [
+        {"$sort": {"submitted_at": -1, "_id": -1}},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": Campaign.Settings.name,
+            "localField": "campaign.$id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"title": 1}}],
+            "as": "campaign",
+        }},
+        {"$lookup": {
+            "from": Orphanage.Settings.name,
+            "localField": "orphanage.$id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"name": 1, "city": 1}}],
+            "as": "orphanage",
+        }},
+        {"$unwind": {"path": "$campaign", "preserveNullAndEmptyArrays": True}},
+        {"$unwind": {"path": "$orphanage", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "title": 1,
+            "report_type": 1,
+            "amount_utilized": 1,
+            "beneficiaries_count": 1,
+            "submitted_at": 1,
+            "campaign": 1,
+            "orphanage": 1,
+        }},
+    ]
+
+
+def public_report_row(raw: Dict) -> PublicReportRow:
+    """Decode a raw public_report_pipeline row"""
+    orphanage = raw.get("orphanage") or {}
+    campaign = raw.get("campaign") or {}
+    return PublicReportRow(
+        id=str(raw["_id"]),
+        title=raw.get("title"),
+        report_type=raw.get("report_type"),
+        amount_utilized=raw.get("amount_utilized"),
+        beneficiaries_count=raw.get("beneficiaries_count"),
+        submitted_at=_iso(raw.get("submitted_at")),
+        orphanage={
+            "id": _str_id(orphanage.get("_id")),
+            "name": orphanage.get("name"),
+            "city": orphanage.get("city"),
+        },
+        campaign={
+            "id": _str_id(campaign.get("_id")),
+            "title": campaign.get("title"),
+        },
+    )
+
+
+async def find_rows(
+    model: Type[Document],
+    query: Dict,
+    projection: Dict,
+    sort: Optional[List] = None,
+    skip: int = 0,
+    limit: int = 0,
+) -> List[Dict]:
+    """Run a raw Motor find with a projection and return the BSON rows undecoded"""
+    cursor = model.get_motor_collection().find(query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    if skip:
+        cursor = cursor.skip(skip)
+    if limit:
+        cursor = cursor.limit(limit)
+    return await cursor.to_list(length=limit or None)
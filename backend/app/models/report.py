@@ -3,6 +3,7 @@ Report Model
 Represents utilization reports submitted by orphanages
 """
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field
 from typing import Optional, List
 from datetime import datetime
@@ -71,7 +72,18 @@ class Report(Document):
     
     class Settings:
         name = "reports"
-        indexes = ["campaign", "orphanage", "status", "report_type"]
+        indexes = [
+            "campaign",
+            "orphanage",
+            "status",
+            "report_type",
+            # Keyset paging for newest-first listings (see app.utils.pagination)
+            IndexModel([("submitted_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("orphanage.$id", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)]),
+            # Reports for a campaign page
+            IndexModel([("campaign.$id", ASCENDING), ("submitted_at", DESCENDING)]),
+        ]
     
     class Config:
         json_schema_extra = {
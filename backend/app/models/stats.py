@@ -0,0 +1,47 @@
+"""
+Stats Model
+Incrementally maintained platform, orphanage and campaign rollups
+"""
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+from typing import Dict, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class StatsScope(str, Enum):
+    """Scope of a stats rollup document"""
+    PLATFORM = "platform"
+    ORPHANAGE = "orphanage"
+    CAMPAIGN = "campaign"
+
+
+class PlatformStats(Document):
+    """Rollup counters updated with $inc on state changes (see app.utils.stats)"""
+
+    # Scope (ref_id is the orphanage/campaign ID; None for the platform document)
+    scope: StatsScope
+    ref_id: Optional[str] = None
+
+    # Financial
+    total_raised: float = 0.0
+    total_disbursed: float = 0.0
+
+    # Counts
+    total_donations: int = 0
+    total_donors: int = 0
+    active_campaigns: int = 0
+    verified_orphanages: int = 0
+    donations_by_status: Dict[str, int] = {}
+
+    # Metadata
+    version: int = 0  # bumped by every $inc; a rebuild only replaces documents it saw unchanged
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    rebuilt_at: Optional[datetime] = None
+
+    class Settings:
+        name = "platform_stats"
+        indexes = [
+            IndexModel([("scope", ASCENDING), ("ref_id", ASCENDING)], unique=True),
+        ]
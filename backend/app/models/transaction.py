@@ -3,6 +3,7 @@ Transaction Model
 Represents all financial transactions (donations and disbursements)
 """
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field
 from typing import Optional
 from datetime import datetime
@@ -69,12 +70,20 @@ class Transaction(Document):
     class Settings:
         name = "transactions"
         indexes = [
-            "transaction_id",
+            # Unique: refunds are keyed by gateway refund ID (RFD<id>) and deduplicated on insert
+            IndexModel([("transaction_id", ASCENDING)], unique=True),
             "transaction_type",
             "status",
             "campaign",
             "orphanage",
-            "donor"
+            "donor",
+            # Keyset paging for an orphanage's payout history (see app.utils.pagination)
+            IndexModel([
+                ("orphanage.$id", ASCENDING),
+                ("transaction_type", ASCENDING),
+                ("transaction_date", DESCENDING),
+                ("_id", DESCENDING),
+            ]),
         ]
     
     class Config:
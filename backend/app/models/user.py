@@ -35,6 +35,9 @@ class User(Document):
     # Metadata
     last_login: Optional[datetime] = None
     
+    # Bumped on profile/password/status changes; lets cached copies be revalidated cheaply
+    version: int = 0
+    
     class Settings:
         name = "users"
         indexes = ["email", "role"]
@@ -0,0 +1,43 @@
+"""
+Webhook Event Model
+Inbox of gateway webhook deliveries, applied asynchronously by the webhook worker
+"""
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class WebhookEventStatus(str, Enum):
+    """Processing state of an inbox entry"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"  # gave up after WEBHOOK_MAX_ATTEMPTS
+
+
+class WebhookEvent(Document):
+    """One webhook delivery, deduplicated by the gateway's event ID"""
+
+    event_id: str
+    event: str
+    payload: Dict[str, Any]
+
+    status: WebhookEventStatus = WebhookEventStatus.PENDING
+    attempts: int = 0
+    last_error: Optional[str] = None
+    # Lease: a PROCESSING entry whose lease expired is picked up again (worker crashed)
+    locked_until: Optional[datetime] = None
+
+    received_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: Optional[datetime] = None
+
+    class Settings:
+        name = "webhook_inbox"
+        indexes = [
+            IndexModel([("event_id", ASCENDING)], unique=True),
+            # Worker claim query: oldest pending first
+            IndexModel([("status", ASCENDING), ("received_at", ASCENDING)]),
+        ]
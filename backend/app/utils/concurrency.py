@@ -0,0 +1,106 @@
+"""
+Concurrency Utilities
+Run independent awaitables in parallel with bounded fan-out, and blocking work off the event loop
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+# Default cap on awaitables in flight per call (keeps one request from hogging the DB pool)
+DEFAULT_FANOUT = 8
+
+
+async def gather_limited(*awaitables: Awaitable, limit: int = DEFAULT_FANOUT) -> List[Any]:
+    """
+    Await independent operations concurrently, at most `limit` at a time
+
+    Results are returned in argument order, like asyncio.gather. The first
+    exception propagates to the caller.
+
+    Example:
+        campaign, user = await gather_limited(Campaign.get(cid), User.get(uid))
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run(a) for a in awaitables))
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a BoundedExecutor's queue is full"""
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool for blocking CPU work, with a queue-depth bound and metrics
+
+    Keeps calls like bcrypt off the event loop without letting a burst of them
+    starve the default executor used by other libraries.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int = 0):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_queued = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool; raises ExecutorSaturated if max_queue calls are already waiting"""
+        if self.max_queue and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.name} queue full ({self.queued} waiting)")
+
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        dequeued = False
+
+        def leave_queue() -> None:
+            nonlocal dequeued
+            if not dequeued:
+                dequeued = True
+                self.queued -= 1
+
+        def call() -> Any:
+            with self._lock:
+                leave_queue()
+                self.active += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        finally:
+            # A caller cancelled before its call started still has to leave the queue
+            with self._lock:
+                leave_queue()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,180 @@
+"""
+Donation Sweeper
+Archive abandoned INITIATED donations after confirming their gateway orders were never paid
+
+Each create-order leaves an INITIATED donation behind; checkouts that are never
+completed would otherwise stay in the donations collection (and its indexes)
+forever. Orders that did get paid are completed instead, so late payments whose
+callback and webhook were both lost are not dropped; a capture that arrives
+after archiving restores the donation (restore_archived_donation).
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus
+from app.utils.concurrency import gather_limited
+from app.utils.payments import CampaignNotFound, CompletionInProgress, complete_donation
+from app.utils.razorpay import RazorpayError, fetch_order, fetch_order_payments
+from app.utils.stats import increment_stats
+
+
+ARCHIVE_COLLECTION = "donations_archive"
+
+# Gateway order states that may still turn into a payment
+PAYABLE_ORDER_STATES = {"paid", "attempted"}
+
+
+def _archive_collection():
+    return Donation.get_motor_collection().database[ARCHIVE_COLLECTION]
+
+
+async def _archive(raw: Dict[str, Any]) -> bool:
+    """
+    Move one INITIATED donation to the archive; False if it changed state meanwhile
+
+    Safe with several sweepers running at once: the archive copy is only
+    removed by the call that inserted it, and only while the donation is still
+    in the donations collection (i.e. it left INITIATED instead of being archived).
+    """
+    collection = Donation.get_motor_collection()
+    archive = _archive_collection()
+    try:
+        await archive.insert_one({**raw, "archived_at": datetime.utcnow(), "archive_reason": "abandoned"})
+        inserted = True
+    except DuplicateKeyError:
+        # Another sweeper (or an earlier interrupted run) already holds the archive copy
+        inserted = False
+    deleted = await collection.delete_one({"_id": raw["_id"], "status": DonationStatus.INITIATED.value})
+    if deleted.deleted_count:
+        return True
+    if inserted and await collection.count_documents({"_id": raw["_id"]}, limit=1):
+        # Still live and no longer INITIATED (e.g. paid meanwhile): undo our copy
+        await archive.delete_one({"_id": raw["_id"]})
+    return False
+
+
+async def restore_archived_donation(order_id: str) -> Optional[Donation]:
+    """
+    Move an archived donation back for a gateway order that turned out to be paid
+
+    Used when a capture (webhook or reconciliation) arrives for an order whose
+    donation the sweeper already archived.
+
+    Returns:
+        The restored donation, or None if no archived donation has this order ID
+    """
+    collection = Donation.get_motor_collection()
+    archive = _archive_collection()
+    raw = await archive.find_one({"razorpay_order_id": order_id})
+    if raw is None:
+        return None
+    raw.pop("archived_at", None)
+    raw.pop("archive_reason", None)
+    raw.pop("sweep_next_check_at", None)
+    try:
+        await collection.insert_one(raw)
+        await increment_stats({}, platform_deltas={f"donations_by_status.{raw['status']}": 1})
+    except DuplicateKeyError:
+        pass  # restored concurrently
+    await archive.delete_one({"_id": raw["_id"]})
+    return await Donation.get(raw["_id"])
+
+
+async def _resolve(raw: Dict[str, Any]) -> str:
+    """
+    Decide one abandoned donation against the gateway
+
+    Returns:
+        "completed", "archived", "kept" (still payable or changed) or "error"
+    """
+    order_id = raw.get("razorpay_order_id")
+    try:
+        order = await fetch_order(order_id) if order_id else None
+        if order and order.get("status") in PAYABLE_ORDER_STATES:
+            order_payments = await fetch_order_payments(order_id)
+            captured = [p for p in order_payments if p.get("status") == "captured"]
+            if captured:
+                donation = await Donation.get(raw["_id"])
+                if donation and await complete_donation(donation, captured[0]["id"], order_id):
+                    return "completed"
+                return "kept"
+            # Paid, or an authorized payment that may still be captured
+            if order.get("status") == "paid" or any(p.get("status") == "authorized" for p in order_payments):
+                return "kept"
+    except RazorpayError as e:
+        print(f"⚠️  Donation sweep: gateway check failed for {order_id}: {e}")
+        return "error"
+    except (CampaignNotFound, CompletionInProgress) as e:
+        print(f"⚠️  Donation sweep: could not complete {raw['_id']}: {e}")
+        return "kept"
+    return "archived" if await _archive(raw) else "kept"
+
+
+async def sweep_abandoned_donations() -> Dict[str, int]:
+    """
+    One sweep: check up to DONATION_SWEEP_BATCH_SIZE stale INITIATED donations
+
+    Gateway lookups run with bounded concurrency (DONATION_SWEEP_CONCURRENCY).
+    Donations that are kept (still payable, campaign missing) or whose gateway
+    check failed are not checked again for DONATION_SWEEP_RECHECK_MINUTES, so
+    they cannot fill every batch and starve newer abandoned checkouts.
+
+    Returns:
+        Count per outcome (completed / archived / kept / error)
+    """
+    # Lets captures for archived orders find their donation (no-op once the index exists)
+    await _archive_collection().create_index("razorpay_order_id")
+
+    collection = Donation.get_motor_collection()
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=settings.DONATION_ABANDON_AFTER_MINUTES)
+    # Full raw documents: they are copied verbatim into the archive
+    stale: List[Dict] = await collection.find({
+        "status": DonationStatus.INITIATED.value,
+        "created_at": {"$lt": cutoff},
+        "$or": [{"sweep_next_check_at": None}, {"sweep_next_check_at": {"$lt": now}}],
+    }).sort("created_at", 1).limit(settings.DONATION_SWEEP_BATCH_SIZE).to_list(None)
+
+    outcomes = {"completed": 0, "archived": 0, "kept": 0, "error": 0}
+    if not stale:
+        return outcomes
+
+    results = await gather_limited(
+        *(_resolve(raw) for raw in stale),
+        limit=settings.DONATION_SWEEP_CONCURRENCY,
+    )
+    for outcome in results:
+        outcomes[outcome] += 1
+
+    recheck = [raw["_id"] for raw, outcome in zip(stale, results) if outcome in ("kept", "error")]
+    if recheck:
+        await collection.update_many(
+            {"_id": {"$in": recheck}, "status": DonationStatus.INITIATED.value},
+            {"$set": {"sweep_next_check_at": now + timedelta(minutes=settings.DONATION_SWEEP_RECHECK_MINUTES)}},
+        )
+
+    if outcomes["archived"]:
+        await increment_stats({}, platform_deltas={
+            f"donations_by_status.{DonationStatus.INITIATED.value}": -outcomes["archived"],
+        })
+    return outcomes
+
+
+async def run_donation_sweeper() -> None:
+    """Background task: sweep every DONATION_SWEEP_INTERVAL_SECONDS (back-to-back while batches are full)"""
+    while True:
+        try:
+            outcomes = await sweep_abandoned_donations()
+            if any(outcomes.values()):
+                print(f"🧹 Donation sweep: {outcomes}")
+            # A full batch means more backlog is likely waiting (kept rows are deferred, not re-picked);
+            # gateway errors wait for the interval instead
+            if sum(outcomes.values()) >= settings.DONATION_SWEEP_BATCH_SIZE and not outcomes["error"]:
+                continue
+        except Exception as e:
+            print(f"⚠️  Donation sweep error: {e}")
+        await asyncio.sleep(settings.DONATION_SWEEP_INTERVAL_SECONDS)
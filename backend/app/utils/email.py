@@ -1,14 +1,177 @@
 """
 Email Utilities
-Send emails for notifications and confirmations
+Render notification emails and queue them in the outbox; deliver over pooled SMTP sessions
+
+The send_*_email helpers only store the rendered message in the email_outbox
+collection, so request handlers never wait on the mail server. The email
+worker (app.utils.email_outbox) delivers queued messages with send_email.
 """
-import aiosmtplib
+import asyncio
+import time
+from collections import deque
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Any, Deque, Dict, List, Optional
+
+import aiosmtplib
 from jinja2 import Template
-from typing import List, Optional
 
 from app.core.config import settings
+from app.models.email_outbox import OutboxEmail
+
+
+class _Session:
+    """One connected, logged-in SMTP client and its usage"""
+
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """
+    Persistent, authenticated SMTP sessions shared by all senders in a worker
+
+    At most max_sessions sessions exist at once; extra senders wait for one.
+    Idle sessions are reused until they have been idle for idle_seconds or have
+    sent max_messages, which saves the TCP/TLS handshake and login per message.
+    A session the server has already dropped is replaced and the message
+    retried once; any other failure discards the session and is raised.
+    """
+
+    RATE_WINDOW_SECONDS = 60
+
+    def __init__(self, max_sessions: int, idle_seconds: float, max_messages: int):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._idle: List[_Session] = []
+        self._recent: Deque[float] = deque()
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.sent = 0
+        self.failed = 0
+        self.connects = 0
+        self.reconnects = 0
+        self._send_seconds = 0.0
+
+    async def _connect(self) -> _Session:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=True,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+        await smtp.connect()  # also logs in, since credentials were given
+        self.connects += 1
+        self.open += 1
+        return _Session(smtp)
+
+    async def _discard(self, session: _Session, polite: bool = False) -> None:
+        self.open -= 1
+        try:
+            if polite and session.smtp.is_connected:
+                await session.smtp.quit()
+            else:
+                session.smtp.close()
+        except Exception:
+            session.smtp.close()
+
+    async def _checkout(self) -> _Session:
+        while self._idle:
+            session = self._idle.pop()
+            if session.smtp.is_connected and time.monotonic() - session.last_used < self.idle_seconds:
+                return session
+            await self._discard(session, polite=True)
+        return await self._connect()
+
+    async def _checkin(self, session: _Session) -> None:
+        session.messages += 1
+        session.last_used = time.monotonic()
+        if session.messages >= self.max_messages:
+            await self._discard(session, polite=True)
+        else:
+            self._idle.append(session)
+
+    async def send(self, message: Message) -> None:
+        """
+        Send one message on a pooled session
+
+        Raises:
+            aiosmtplib.SMTPException: Delivery failed (after one reconnect for a dropped session)
+        """
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_use += 1
+        started = time.monotonic()
+        try:
+            for attempt in range(2):
+                session = await self._checkout()
+                try:
+                    await session.smtp.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # Typically an idle session the server timed out; replace it once
+                    await self._discard(session)
+                    if attempt:
+                        raise
+                    self.reconnects += 1
+                    continue
+                except BaseException:
+                    await self._discard(session)
+                    raise
+                await self._checkin(session)
+                break
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.in_use -= 1
+            self._slots.release()
+        now = time.monotonic()
+        self.sent += 1
+        self._send_seconds += now - started
+        self._recent.append(now)
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await self._discard(session, polite=True)
+
+    def stats(self) -> Dict[str, Any]:
+        cutoff = time.monotonic() - self.RATE_WINDOW_SECONDS
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+        return {
+            "max_sessions": self.max_sessions,
+            "open_sessions": self.open,
+            "idle_sessions": len(self._idle),
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "sent": self.sent,
+            "failed": self.failed,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "sent_last_minute": len(self._recent),
+            "send_rate_per_second": round(len(self._recent) / self.RATE_WINDOW_SECONDS, 2),
+            "avg_send_ms": round(self._send_seconds / self.sent * 1000, 1) if self.sent else None,
+        }
+
+
+# Shared SMTP session pool (per worker; closed on app shutdown)
+smtp_pool = SMTPPool(
+    max_sessions=settings.SMTP_POOL_SIZE,
+    idle_seconds=settings.SMTP_SESSION_IDLE_SECONDS,
+    max_messages=settings.SMTP_SESSION_MAX_MESSAGES,
+)
 
 
 async def send_email(
@@ -18,7 +181,7 @@ async def send_email(
     text_content: Optional[str] = None
 ):
     """
-    Send an email using SMTP
+    Send an email over a pooled SMTP session
     
     Args:
         to_email: Recipient email address
@@ -41,22 +204,45 @@ async def send_email(
     message.attach(part2)
     
     try:
-        await aiosmtplib.send(
-            message,
-            hostname=settings.SMTP_HOST,
-            port=settings.SMTP_PORT,
-            username=settings.SMTP_USER,
-            password=settings.SMTP_PASSWORD,
-            use_tls=True
-        )
+        await smtp_pool.send(message)
         print(f"✅ Email sent to {to_email}")
     except Exception as e:
         print(f"❌ Failed to send email to {to_email}: {str(e)}")
         raise
 
 
+# Set when a message is queued so the worker in this process sends it without waiting
+outbox_wakeup = asyncio.Event()
+
+
+async def enqueue_email(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> OutboxEmail:
+    """
+    Queue an email for background delivery (returns once it is stored)
+
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_content: HTML email body
+        text_content: Plain text email body (optional)
+    """
+    entry = OutboxEmail(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        text_content=text_content,
+    )
+    await entry.insert()
+    outbox_wakeup.set()
+    return entry
+
+
 async def send_welcome_email(user_email: str, user_name: str, role: str):
-    """Send welcome email to new user"""
+    """Queue welcome email to new user"""
     html_template = """
     <html>
         <body style="font-family: Arial, sans-serif;">
@@ -73,7 +259,7 @@ async def send_welcome_email(user_email: str, user_name: str, role: str):
     template = Template(html_template)
     html_content = template.render(name=user_name, role=role.title())
     
-    await send_email(
+    await enqueue_email(
         to_email=user_email,
         subject="Welcome to Heart-Chain!",
         html_content=html_content
@@ -86,7 +272,7 @@ async def send_orphanage_verification_email(
     status: str,
     message: Optional[str] = None
 ):
-    """Send email about orphanage verification status"""
+    """Queue email about orphanage verification status"""
     html_template = """
     <html>
         <body style="font-family: Arial, sans-serif;">
@@ -105,7 +291,7 @@ async def send_orphanage_verification_email(
     template = Template(html_template)
     html_content = template.render(name=orphanage_name, status=status, message=message)
     
-    await send_email(
+    await enqueue_email(
         to_email=email,
         subject=f"Orphanage Verification {status}",
         html_content=html_content
@@ -119,7 +305,7 @@ async def send_donation_confirmation_email(
     amount: float,
     transaction_id: str
 ):
-    """Send donation confirmation email"""
+    """Queue donation confirmation email"""
     html_template = """
     <html>
         <body style="font-family: Arial, sans-serif;">
@@ -142,7 +328,7 @@ async def send_donation_confirmation_email(
         transaction_id=transaction_id
     )
     
-    await send_email(
+    await enqueue_email(
         to_email=donor_email,
         subject="Donation Confirmation - Heart-Chain",
         html_content=html_content
@@ -155,7 +341,7 @@ async def send_fund_disbursement_email(
     campaign_title: str,
     amount: float
 ):
-    """Send fund disbursement notification"""
+    """Queue fund disbursement notification"""
     html_template = """
     <html>
         <body style="font-family: Arial, sans-serif;">
@@ -176,7 +362,7 @@ async def send_fund_disbursement_email(
         campaign=campaign_title
     )
     
-    await send_email(
+    await enqueue_email(
         to_email=orphanage_email,
         subject="Fund Disbursement Notification",
         html_content=html_content
@@ -0,0 +1,146 @@
+"""
+Email Outbox Worker
+Deliver queued emails from the email_outbox collection in the background
+
+The worker claims due entries in batches with a lease, sends them over the
+shared SMTP pool, and retries failures with exponential backoff. Messages the
+server rejects permanently, or that exhaust EMAIL_MAX_ATTEMPTS, are kept as
+DEAD entries for inspection instead of being retried forever.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import aiosmtplib
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.models.email_outbox import OutboxEmail, OutboxStatus
+from app.utils.concurrency import gather_limited
+from app.utils.email import outbox_wakeup, send_email, smtp_pool
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Rejections that will fail the same way on every retry (bad recipient, 5xx on the message)"""
+    if isinstance(error, (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPRecipientRefused)):
+        return True
+    return isinstance(error, aiosmtplib.SMTPDataError) and 500 <= error.code < 600
+
+
+async def claim_email_batch(limit: int) -> List[Dict]:
+    """Lease up to `limit` due outbox entries (new, retry-due, or with an expired lease), oldest first"""
+    collection = OutboxEmail.get_motor_collection()
+    now = datetime.utcnow()
+    lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    claimed = []
+    for _ in range(limit):
+        entry = await collection.find_one_and_update(
+            {
+                "status": {"$in": [OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]},
+                "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}],
+            },
+            {
+                "$set": {"status": OutboxStatus.SENDING.value, "locked_until": lease},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if entry is None:
+            break
+        claimed.append(entry)
+    return claimed
+
+
+async def _deliver(entry: Dict) -> bool:
+    """
+    Send one claimed entry and record the outcome; False if it failed or was skipped
+
+    The batch lease is renewed right before sending, conditional on it still
+    being ours: an entry that waited in the batch until its lease expired and
+    was re-claimed by another worker is skipped instead of sent twice.
+    """
+    collection = OutboxEmail.get_motor_collection()
+    lease = datetime.utcnow() + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    # BSON dates keep milliseconds, and the lease is matched by equality below
+    lease = lease.replace(microsecond=lease.microsecond // 1000 * 1000)
+    renewed = await collection.update_one(
+        {"_id": entry["_id"], "status": OutboxStatus.SENDING.value, "locked_until": entry["locked_until"]},
+        {"$set": {"locked_until": lease}},
+    )
+    if not renewed.modified_count:
+        return False
+    owned = {"_id": entry["_id"], "locked_until": lease}
+    try:
+        await send_email(
+            to_email=entry["to_email"],
+            subject=entry["subject"],
+            html_content=entry["html_content"],
+            text_content=entry.get("text_content"),
+        )
+    except Exception as e:
+        attempts = entry["attempts"]
+        dead = _is_permanent(e) or attempts >= settings.EMAIL_MAX_ATTEMPTS
+        retry_at = datetime.utcnow() + timedelta(
+            seconds=settings.EMAIL_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+        )
+        await collection.update_one(owned, {"$set": {
+            "status": (OutboxStatus.DEAD if dead else OutboxStatus.PENDING).value,
+            "locked_until": None if dead else retry_at,
+            "last_error": str(e)[:500],
+        }})
+        if dead:
+            print(f"⚠️  Email {entry['_id']} to {entry['to_email']} dead-lettered after {attempts} attempt(s): {e}")
+        return False
+    await collection.update_one(owned, {"$set": {
+        "status": OutboxStatus.SENT.value,
+        "locked_until": None,
+        "sent_at": datetime.utcnow(),
+    }})
+    return True
+
+
+async def process_email_batch() -> int:
+    """
+    Claim and send one batch of outbox entries (up to SMTP_POOL_SIZE at a time); returns the number claimed
+
+    Each entry's lease is renewed when its send starts, so entries queued behind
+    slow sends in the same batch are not re-claimed by another worker mid-send.
+    """
+    entries = await claim_email_batch(settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if entries:
+        await gather_limited(*(_deliver(entry) for entry in entries), limit=settings.SMTP_POOL_SIZE)
+    return len(entries)
+
+
+async def run_email_worker() -> None:
+    """Background task: drain the outbox, then wait for a new message or EMAIL_OUTBOX_POLL_INTERVAL_SECONDS"""
+    while True:
+        try:
+            claimed = await process_email_batch()
+        except Exception as e:
+            print(f"⚠️  Email worker error: {e}")
+            claimed = 0
+        if claimed >= settings.EMAIL_OUTBOX_BATCH_SIZE:
+            continue
+        try:
+            await asyncio.wait_for(outbox_wakeup.wait(), timeout=settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        outbox_wakeup.clear()
+
+
+async def email_outbox_stats() -> Dict[str, Any]:
+    """Queue depth per state and age of the oldest unsent message (shared across workers)"""
+    collection = OutboxEmail.get_motor_collection()
+    depth = {
+        state.value: await collection.count_documents({"status": state.value})
+        for state in (OutboxStatus.PENDING, OutboxStatus.SENDING, OutboxStatus.DEAD)
+    }
+    oldest = await collection.find_one(
+        {"status": {"$in": [OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]}},
+        {"created_at": 1},
+        sort=[("created_at", 1)],
+    )
+    age = (datetime.utcnow() - oldest["created_at"]).total_seconds() if oldest else 0.0
+    return {**depth, "oldest_unsent_age_seconds": round(age, 1), "smtp": smtp_pool.stats()}
@@ -0,0 +1,82 @@
+"""
+Pagination Utilities
+Opaque keyset (cursor) tokens for newest-first list endpoints
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response, status
+
+
+# Response header carrying the token for the next page (list bodies stay plain arrays)
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, doc_id: Any) -> str:
+    """
+    Encode the position of the last item on a page into an opaque token
+
+    Args:
+        sort_value: Value of the sort field (e.g. created_at) of the last item
+        doc_id: `_id` of the last item, used as a tie-breaker
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps({"v": sort_value.isoformat(), "id": str(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor token produced by encode_cursor
+
+    Raises:
+        HTTPException: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["v"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str], field: str) -> Dict:
+    """
+    Build the query that resumes a descending (field, _id) scan after the cursor
+
+    Backed by a compound index on (field -1, _id -1) this seeks directly to the next
+    page instead of scanning and discarding `skip` documents.
+    """
+    if not cursor:
+        return {}
+    value, doc_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": doc_id}},
+        ]
+    }
+
+
+def set_next_cursor(response: Response, page: Sequence[Any], field: str, limit: int) -> None:
+    """
+    Expose the token for the following page when the current page is full
+
+    Works with both Beanie documents and raw aggregation rows.
+    """
+    if not page or len(page) < limit:
+        return
+    last = page[-1]
+    if isinstance(last, dict):
+        value, doc_id = last.get(field), last.get("_id")
+    else:
+        value, doc_id = getattr(last, field, None), last.id
+    if value is None or doc_id is None:
+        return
+    response.headers[CURSOR_HEADER] = encode_cursor(value, doc_id)
@@ -0,0 +1,355 @@
+"""
+Payment Utilities
+Idempotent donation state transitions shared by verify-payment and the webhook worker
+
+Each transition claims the donation with a conditional update first, so the
+checkout callback and a gateway webhook racing on the same payment apply
+counters, stats and ledger entries once. Completion and refund side effects
+are tracked per step on the donation, so an interrupted completion is finished
+by the next webhook retry or reconciliation run, and an interrupted refund by
+the next webhook retry, instead of being lost.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.cache import invalidate_campaign
+from app.models.campaign import Campaign
+from app.models.donation import Donation, DonationStatus
+from app.models.transaction import Transaction, TransactionType, TransactionStatus
+from app.utils.counters import record_campaign_donation
+from app.utils.email import send_donation_confirmation_email
+from app.utils.links import link_id
+from app.utils.stats import count_new_donor, increment_stats
+
+
+# Statuses a payment can still move out of
+OPEN_STATUSES = [DonationStatus.INITIATED.value, DonationStatus.PENDING.value, DonationStatus.FAILED.value]
+
+# How long one call may hold a donation while applying its completion side effects
+COMPLETION_LEASE_SECONDS = 60
+
+
+async def _claim(query: Dict[str, Any], updates: Dict[str, Any]) -> Optional[Dict]:
+    """Conditionally update one donation; returns the raw document as it was BEFORE, or None"""
+    return await Donation.get_motor_collection().find_one_and_update(
+        query,
+        {"$set": {**updates, "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.BEFORE,
+    )
+
+
+class CampaignNotFound(Exception):
+    """The donation's campaign no longer exists, so its completion cannot be applied"""
+
+
+class CompletionInProgress(Exception):
+    """Another call is applying this donation's completion side effects right now"""
+
+
+class RefundInProgress(Exception):
+    """Another call holds this donation's effects lease (a completion or another refund)"""
+
+
+async def _campaign_exists(campaign_id: Any) -> bool:
+    return bool(await Campaign.get_motor_collection().count_documents({"_id": campaign_id}, limit=1))
+
+
+async def _ledger_entry(donation_id: Any) -> Optional[Transaction]:
+    return await Transaction.find_one(
+        Transaction.donation.id == donation_id,
+        Transaction.transaction_type == TransactionType.DONATION,
+    )
+
+
+async def complete_donation(
+    donation: Donation,
+    payment_id: str,
+    order_id: str,
+    signature: Optional[str] = None,
+) -> Optional[Transaction]:
+    """
+    Mark a donation completed and apply its side effects once
+
+    The status flip and the side effects are separate steps: a call that
+    finds the donation already COMPLETED but its effects unfinished (a crash
+    or error in an earlier call) finishes them, so webhook retries and
+    reconciliation re-drive an interrupted completion.
+
+    Args:
+        donation: Donation being paid
+        payment_id: Gateway payment ID
+        order_id: Gateway order ID
+        signature: Checkout signature (None when driven by a webhook)
+
+    Returns:
+        The donation's ledger Transaction (the existing one if it was already
+        completed), or None if it has none (completed before the ledger existed)
+
+    Raises:
+        CampaignNotFound: The campaign is gone; the donation is left as it was
+        CompletionInProgress: A concurrent call is still applying the side effects
+    """
+    if not await _campaign_exists(link_id(donation.campaign)):
+        raise CampaignNotFound(f"Campaign of donation {donation.id} not found")
+
+    updates = {
+        "status": DonationStatus.COMPLETED.value,
+        "razorpay_payment_id": {"$literal": payment_id},
+        "transaction_date": datetime.utcnow(),
+        "side_effects_applied": False,
+        "effects_done": {"$literal": []},
+    }
+    if signature:
+        updates["razorpay_signature"] = {"$literal": signature}
+    # Pipeline update so the previous status is recorded atomically with the flip (stats use it)
+    await Donation.get_motor_collection().update_one(
+        {"_id": donation.id, "status": {"$in": OPEN_STATUSES}},
+        [{"$set": {**updates, "completed_from": "$status", "updated_at": datetime.utcnow()}}],
+    )
+    # Also finishes effects a previous (crashed) call left unapplied
+    return await apply_completion_effects(donation.id)
+
+
+async def apply_completion_effects(donation_id: Any) -> Optional[Transaction]:
+    """
+    Apply (or finish applying) a completed donation's side effects
+
+    Takes a lease on the donation so only one call applies effects at a time;
+    the ledger entry is looked up before it is created, and the other steps
+    (campaign counters, stats, email) are recorded in effects_done, so a re-run
+    after a failure skips what was already applied.
+
+    Returns:
+        The donation's ledger Transaction, or None if it has none
+
+    Raises:
+        CampaignNotFound: The campaign was deleted after the donation completed
+        CompletionInProgress: Another call holds the lease
+    """
+    collection = Donation.get_motor_collection()
+    now = datetime.utcnow()
+    claimed = await collection.find_one_and_update(
+        {
+            "_id": donation_id,
+            "status": DonationStatus.COMPLETED.value,
+            "side_effects_applied": False,
+            "$or": [{"effects_locked_until": None}, {"effects_locked_until": {"$lt": now}}],
+        },
+        {"$set": {"effects_locked_until": now + timedelta(seconds=COMPLETION_LEASE_SECONDS)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if claimed is None:
+        current = await collection.find_one({"_id": donation_id}, {"side_effects_applied": 1})
+        if current is not None and current.get("side_effects_applied") is False:
+            raise CompletionInProgress(f"Donation {donation_id} completion is being applied")
+        return await _ledger_entry(donation_id)
+
+    done = set(claimed.get("effects_done") or [])
+
+    async def mark(step: str) -> None:
+        await collection.update_one({"_id": donation_id}, {"$addToSet": {"effects_done": step}})
+
+    try:
+        donation = await Donation.get(donation_id)
+        campaign = await Campaign.get(link_id(donation.campaign))
+        if not campaign:
+            raise CampaignNotFound(f"Campaign of donation {donation_id} not found")
+
+        # Ledger entry: looked up first, so a re-run never records the donation twice
+        transaction = await _ledger_entry(donation_id)
+        if transaction is None:
+            transaction = Transaction(
+                transaction_id=f"TXN{uuid.uuid4().hex[:12].upper()}",
+                transaction_type=TransactionType.DONATION,
+                amount=donation.amount,
+                status=TransactionStatus.COMPLETED,
+                campaign=campaign,
+                orphanage=campaign.orphanage,
+                donor=donation.donor,
+                donation=donation,
+                payment_gateway="razorpay",
+                gateway_transaction_id=donation.razorpay_payment_id,
+                gateway_order_id=donation.razorpay_order_id,
+                description=f"Donation to {campaign.title}"
+            )
+            await transaction.insert()
+
+        # Update campaign raised amount atomically (concurrent donations must not overwrite each other)
+        if "campaign" not in done:
+            await record_campaign_donation(campaign.id, donation.amount)
+            await mark("campaign")
+        invalidate_campaign(campaign.id)
+
+        # Roll up platform/orphanage/campaign stats; a donor counts once platform-wide
+        # Marked before the $inc: rebuild_stats leaves out completions not marked yet,
+        # so it never counts one whose $inc is still to come (a lost $inc is drift it repairs)
+        if "stats" not in done:
+            new_donor = await count_new_donor(link_id(donation.donor))
+            previous_status = claimed.get("completed_from") or DonationStatus.INITIATED.value
+            await mark("stats")
+            await increment_stats(
+                {"total_raised": donation.amount, "total_donations": 1},
+                orphanage_id=link_id(campaign.orphanage),
+                campaign_id=campaign.id,
+                platform_deltas={
+                    "total_donors": new_donor,
+                    f"donations_by_status.{previous_status}": -1,
+                    f"donations_by_status.{DonationStatus.COMPLETED.value}": 1,
+                },
+            )
+
+        # Queue confirmation email
+        if "email" not in done:
+            try:
+                await send_donation_confirmation_email(
+                    donor_email=donation.donor_email,
+                    donor_name=donation.donor_name,
+                    campaign_title=campaign.title,
+                    amount=donation.amount,
+                    transaction_id=transaction.transaction_id
+                )
+            except Exception as e:
+                print(f"Failed to queue confirmation email: {str(e)}")
+            await mark("email")
+    except BaseException:
+        # Release the lease so a retry can pick up from the last applied step
+        await collection.update_one({"_id": donation_id}, {"$set": {"effects_locked_until": None}})
+        raise
+
+    await collection.update_one({"_id": donation_id}, {"$set": {
+        "side_effects_applied": True,
+        "effects_locked_until": None,
+    }})
+    return transaction
+
+
+async def fail_donation(donation: Donation, payment_id: Optional[str] = None) -> bool:
+    """
+    Mark an initiated/pending donation failed
+
+    Returns:
+        True if this call changed the status
+    """
+    updates = {"status": DonationStatus.FAILED.value}
+    if payment_id:
+        updates["razorpay_payment_id"] = payment_id
+    before = await _claim(
+        {"_id": donation.id, "status": {"$in": [DonationStatus.INITIATED.value, DonationStatus.PENDING.value]}},
+        updates,
+    )
+    if before is None:
+        return False
+    await increment_stats({}, platform_deltas={
+        f"donations_by_status.{before['status']}": -1,
+        f"donations_by_status.{DonationStatus.FAILED.value}": 1,
+    })
+    return True
+
+
+async def refund_donation(donation: Donation, refund_id: str, amount: float) -> bool:
+    """
+    Record a processed gateway refund against a completed donation
+
+    Runs under the donation's effects lease, and each step (ledger entry,
+    status, campaign counters, stats) is recorded in refund_effects_done as
+    "<refund_id>:<step>", so a retry after a failure finishes the remaining
+    steps and a refund that is already applied is skipped. The REFUND ledger
+    entry is keyed by the gateway refund ID (unique index). A refund covering
+    the whole donation also moves it to REFUNDED.
+
+    Args:
+        donation: Donation that was refunded
+        refund_id: Gateway refund ID
+        amount: Refunded amount in rupees
+
+    Returns:
+        True if this call finished applying the refund
+
+    Raises:
+        RefundInProgress: Another call holds the donation's effects lease
+    """
+    collection = Donation.get_motor_collection()
+    now = datetime.utcnow()
+    claimed = await collection.find_one_and_update(
+        {
+            "_id": donation.id,
+            "status": {"$in": [DonationStatus.COMPLETED.value, DonationStatus.REFUNDED.value]},
+            "side_effects_applied": {"$ne": False},
+            "$or": [{"effects_locked_until": None}, {"effects_locked_until": {"$lt": now}}],
+        },
+        {"$set": {"effects_locked_until": now + timedelta(seconds=COMPLETION_LEASE_SECONDS)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if claimed is None:
+        raise RefundInProgress(f"Donation {donation.id} effects are being applied")
+
+    done = set(claimed.get("refund_effects_done") or [])
+    if f"{refund_id}:stats" in done:
+        await collection.update_one({"_id": donation.id}, {"$set": {"effects_locked_until": None}})
+        return False
+
+    async def mark(step: str) -> None:
+        await collection.update_one({"_id": donation.id}, {"$addToSet": {"refund_effects_done": f"{refund_id}:{step}"}})
+
+    try:
+        campaign = await Campaign.get(link_id(donation.campaign))
+
+        # Ledger entry: marked first, so rebuild_stats sees the refund as pending until
+        # its stats step; the unique transaction_id makes a repeated insert a no-op
+        await mark("ledger")
+        try:
+            await Transaction(
+                transaction_id=f"RFD{refund_id}",
+                transaction_type=TransactionType.REFUND,
+                amount=amount,
+                status=TransactionStatus.COMPLETED,
+                campaign=campaign,
+                orphanage=campaign.orphanage if campaign else None,
+                donor=donation.donor,
+                donation=donation,
+                payment_gateway="razorpay",
+                gateway_transaction_id=refund_id,
+                gateway_order_id=donation.razorpay_order_id,
+                description=f"Refund of donation {donation.id}"
+            ).insert()
+        except DuplicateKeyError:
+            pass  # recorded by an earlier, interrupted attempt
+
+        # Status flip and its marker in one write, so a retry knows whether this refund made it
+        if amount >= donation.amount and f"{refund_id}:status" not in done:
+            result = await collection.update_one(
+                {"_id": donation.id, "status": DonationStatus.COMPLETED.value},
+                {
+                    "$set": {"status": DonationStatus.REFUNDED.value, "updated_at": datetime.utcnow()},
+                    "$addToSet": {"refund_effects_done": f"{refund_id}:status"},
+                },
+            )
+            if result.modified_count:
+                done.add(f"{refund_id}:status")
+        flipped = f"{refund_id}:status" in done
+        status_deltas = {
+            f"donations_by_status.{DonationStatus.COMPLETED.value}": -1,
+            f"donations_by_status.{DonationStatus.REFUNDED.value}": 1,
+        } if flipped else {}
+
+        if campaign and f"{refund_id}:campaign" not in done:
+            await record_campaign_donation(campaign.id, -amount, donors=-1 if flipped else 0)
+            await mark("campaign")
+        if campaign:
+            invalidate_campaign(campaign.id)
+
+        # Marked before the $inc, as for completions (see apply_completion_effects)
+        await mark("stats")
+        await increment_stats(
+            {"total_raised": -amount, "total_donations": -1 if flipped else 0},
+            orphanage_id=link_id(campaign.orphanage) if campaign else None,
+            campaign_id=campaign.id if campaign else None,
+            platform_deltas=status_deltas,
+        )
+    finally:
+        await collection.update_one({"_id": donation.id}, {"$set": {"effects_locked_until": None}})
+    return True
@@ -2,22 +2,123 @@
 Razorpay Payment Integration
 Handle payment creation, verification, and webhooks
 """
-import razorpay
+import asyncio
 import hmac
 import hashlib
-from typing import Dict, Any
+import random
+from typing import Dict, Any, List, Optional
+
+import httpx
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 
 
-# Initialize Razorpay client
-razorpay_client = razorpay.Client(
-    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
+class RazorpayError(Exception):
+    """Gateway call failed (after retries) or returned an error response"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+# Responses worth retrying: rate limiting and transient gateway/server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RazorpayGateway:
+    """
+    Async Razorpay REST client on a persistent httpx connection pool
+
+    Retries with exponential backoff and jitter. Non-idempotent calls (order
+    creation, refunds) are only retried when the request never reached the
+    gateway (connect errors), so a retry cannot create a second order or refund.
+    """
+
+    def __init__(self, base_url: str, key_id: str, key_secret: str):
+        self.base_url = base_url.rstrip("/")
+        self._auth = (key_id, key_secret)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.retries = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self._auth,
+                timeout=httpx.Timeout(settings.RAZORPAY_TIMEOUT_SECONDS, connect=settings.RAZORPAY_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.RAZORPAY_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.RAZORPAY_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        idempotent: bool = True,
+    ) -> Dict:
+        """
+        Call the gateway and return the decoded JSON body
+
+        Raises:
+            RazorpayError: Error response, or transient failures exhausted retries
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, path, json=json, params=params)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # Never sent: safe to retry any call
+                error = RazorpayError(f"{method} {path}: {e!r}")
+            except httpx.TransportError as e:
+                if not idempotent:
+                    raise RazorpayError(f"{method} {path}: {e!r}") from e
+                error = RazorpayError(f"{method} {path}: {e!r}")
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                body = _json_or_text(response)
+                error = RazorpayError(f"{method} {path}: HTTP {response.status_code}", response.status_code, body)
+                if response.status_code not in RETRY_STATUS_CODES or not idempotent:
+                    raise error
+
+            if attempt >= settings.RAZORPAY_MAX_RETRIES:
+                raise error
+            attempt += 1
+            self.retries += 1
+            delay = settings.RAZORPAY_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _json_or_text(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+# Shared gateway client (one connection pool per worker; closed on app shutdown)
+razorpay_gateway = RazorpayGateway(
+    settings.RAZORPAY_API_BASE,
+    settings.RAZORPAY_KEY_ID,
+    settings.RAZORPAY_KEY_SECRET,
 )
 
 
-def create_payment_order(amount: float, currency: str = "INR", notes: Dict[str, Any] = None) -> Dict:
+async def create_payment_order(amount: float, currency: str = "INR", notes: Dict[str, Any] = None) -> Dict:
     """
     Create a Razorpay payment order
     
@@ -39,7 +140,7 @@ def create_payment_order(amount: float, currency: str = "INR", notes: Dict[str,
             "notes": notes or {}
         }
         
-        order = razorpay_client.order.create(data=order_data)
+        order = await razorpay_gateway.request("POST", "/orders", json=order_data, idempotent=False)
         return order
     
     except Exception as e:
@@ -110,7 +211,7 @@ def verify_webhook_signature(payload: bytes, signature: str) -> bool:
         return False
 
 
-def get_payment_details(payment_id: str) -> Dict:
+async def get_payment_details(payment_id: str) -> Dict:
     """
     Fetch payment details from Razorpay
     
@@ -121,7 +222,7 @@ def get_payment_details(payment_id: str) -> Dict:
         Payment details
     """
     try:
-        payment = razorpay_client.payment.fetch(payment_id)
+        payment = await razorpay_gateway.request("GET", f"/payments/{payment_id}")
         return payment
     except Exception as e:
         print(f"❌ Failed to fetch payment details: {str(e)}")
@@ -131,7 +232,49 @@ def get_payment_details(payment_id: str) -> Dict:
         )
 
 
-def refund_payment(payment_id: str, amount: int = None) -> Dict:
+async def fetch_order(order_id: str) -> Optional[Dict]:
+    """
+    Fetch an order for background jobs (no HTTPException wrapping)
+    
+    Returns:
+        Order details, or None if the gateway does not know the order
+    
+    Raises:
+        RazorpayError: Any other gateway failure
+    """
+    try:
+        return await razorpay_gateway.request("GET", f"/orders/{order_id}")
+    except RazorpayError as e:
+        if e.status_code in (400, 404):
+            return None
+        raise
+
+
+async def fetch_order_payments(order_id: str) -> List[Dict]:
+    """
+    Fetch all payment attempts for an order (background jobs)
+    
+    Raises:
+        RazorpayError: Gateway failure
+    """
+    response = await razorpay_gateway.request("GET", f"/orders/{order_id}/payments")
+    return response.get("items", [])
+
+
+async def list_payments(from_ts: int, to_ts: int, count: int = 100, skip: int = 0) -> List[Dict]:
+    """
+    One page of payments created in [from_ts, to_ts] (unix seconds), for background jobs
+    
+    Raises:
+        RazorpayError: Gateway failure
+    """
+    response = await razorpay_gateway.request(
+        "GET", "/payments", params={"from": from_ts, "to": to_ts, "count": count, "skip": skip}
+    )
+    return response.get("items", [])
+
+
+async def refund_payment(payment_id: str, amount: int = None) -> Dict:
     """
     Create a refund for a payment
     
@@ -147,7 +290,9 @@ def refund_payment(payment_id: str, amount: int = None) -> Dict:
         if amount:
             refund_data["amount"] = amount
         
-        refund = razorpay_client.payment.refund(payment_id, refund_data)
+        refund = await razorpay_gateway.request(
+            "POST", f"/payments/{payment_id}/refund", json=refund_data, idempotent=False
+        )
         return refund
     except Exception as e:
         print(f"❌ Failed to create refund: {str(e)}")
@@ -0,0 +1,243 @@
+"""
+Payment Reconciliation
+Compare gateway payments with donations over a time window and repair missed completions
+
+Gateway payments are paged newest first and matched page by page against
+Donation.razorpay_order_id (one indexed $in query per page). Captured payments
+whose donation never completed are repaired through complete_donation with
+bounded concurrency, and completions whose side effects were interrupted are
+finished; every other mismatch is reported for review.
+
+Run from the backend directory:
+    python -m app.utils.reconciliation --hours 24 --dry-run
+    python -m app.utils.reconciliation --from 2026-10-01T00:00 --to 2026-10-02T00:00
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Dict, List, Set, Tuple
+
+from beanie.operators import In
+
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus
+from app.utils.concurrency import gather_limited
+from app.utils.donation_sweeper import restore_archived_donation
+from app.utils.payments import (
+    CampaignNotFound,
+    CompletionInProgress,
+    apply_completion_effects,
+    complete_donation,
+)
+from app.utils.razorpay import list_payments
+
+
+PAGE_SIZE = 100  # gateway maximum per page
+SAMPLE_LIMIT = 50  # ids kept per mismatch kind in the report
+
+
+class _Report:
+    """Mismatch counters plus a bounded sample of ids per kind"""
+
+    def __init__(self, start: datetime, end: datetime, dry_run: bool):
+        self.start, self.end, self.dry_run = start, end, dry_run
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.samples: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def note(self, kind: str, **detail: Any) -> None:
+        self.counts[kind] += 1
+        if len(self.samples[kind]) < SAMPLE_LIMIT:
+            self.samples[kind].append(detail)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "window": {"from": self.start.isoformat(), "to": self.end.isoformat()},
+            "dry_run": self.dry_run,
+            "counts": dict(self.counts),
+            "samples": dict(self.samples),
+        }
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Naive UTC, as stored by the models; an aware value (e.g. +05:30) is converted, not relabelled"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _unix(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+async def _reconcile_page(page: List[Dict], report: _Report, seen: Set[str]) -> None:
+    order_ids = list({p["order_id"] for p in page if p.get("order_id")})
+    donations = {
+        d.razorpay_order_id: d
+        for d in await Donation.find(In(Donation.razorpay_order_id, order_ids)).to_list()
+    } if order_ids else {}
+
+    repairs: List[Tuple[Donation, Dict]] = []
+    for payment in page:
+        seen.add(payment["id"])
+        gateway_status = payment.get("status")
+        donation = donations.get(payment.get("order_id"))
+        ids = {"payment_id": payment["id"], "order_id": payment.get("order_id")}
+
+        if gateway_status == "captured":
+            report.counts["captured"] += 1
+            if donation is None and payment.get("order_id") and not report.dry_run:
+                # Paid after the sweeper archived the abandoned checkout
+                donation = await restore_archived_donation(payment["order_id"])
+                if donation is not None:
+                    report.note("restored_from_archive", donation_id=str(donation.id), **ids)
+            if donation is None:
+                report.note("captured_without_donation", **ids)
+            elif payment.get("amount") != round(donation.amount * 100):
+                report.note("amount_mismatch", donation_id=str(donation.id), gateway_paise=payment.get("amount"), **ids)
+            elif donation.status in (DonationStatus.COMPLETED, DonationStatus.REFUNDED):
+                if donation.razorpay_payment_id and donation.razorpay_payment_id != payment["id"]:
+                    report.note("second_capture_for_order", donation_id=str(donation.id), **ids)
+                elif not donation.side_effects_applied:
+                    # Completed, but an earlier completion was interrupted before its effects ran
+                    repairs.append((donation, payment))
+                else:
+                    report.counts["matched"] += 1
+            else:
+                repairs.append((donation, payment))
+        elif donation is not None and donation.status == DonationStatus.COMPLETED \
+                and donation.razorpay_payment_id == payment["id"]:
+            # Completed here, but the gateway says failed/refunded/authorized only
+            report.note(f"completed_but_gateway_{gateway_status}", donation_id=str(donation.id), **ids)
+
+    if not repairs:
+        return
+    if report.dry_run:
+        for donation, payment in repairs:
+            report.note("would_complete", donation_id=str(donation.id), payment_id=payment["id"], order_id=payment["order_id"])
+        return
+    results = await gather_limited(
+        *(_repair(complete_donation(donation, payment["id"], payment["order_id"])) for donation, payment in repairs),
+        limit=settings.RECONCILE_CONCURRENCY,
+    )
+    for (donation, payment), outcome in zip(repairs, results):
+        report.note(outcome, donation_id=str(donation.id), payment_id=payment["id"], order_id=payment["order_id"])
+
+
+async def _repair(completion: Awaitable) -> str:
+    """Run one completion and name its outcome for the report"""
+    try:
+        await completion
+    except CampaignNotFound:
+        return "repair_campaign_missing"
+    except CompletionInProgress:
+        return "repair_in_progress"
+    except Exception as e:
+        print(f"⚠️  Payment reconciliation: repair failed: {e}")
+        return "repair_failed"
+    return "completed"
+
+
+async def _finish_pending_effects(report: _Report) -> None:
+    """Re-drive completed donations whose side effects were interrupted (any age)"""
+    pending = await Donation.get_motor_collection().find(
+        {"side_effects_applied": False, "status": DonationStatus.COMPLETED.value},
+        {"_id": 1},
+    ).to_list(None)
+    if report.dry_run:
+        for raw in pending:
+            report.note("would_finish_effects", donation_id=str(raw["_id"]))
+        return
+    results = await gather_limited(
+        *(_repair(apply_completion_effects(raw["_id"])) for raw in pending),
+        limit=settings.RECONCILE_CONCURRENCY,
+    )
+    for raw, outcome in zip(pending, results):
+        report.note("effects_finished" if outcome == "completed" else outcome, donation_id=str(raw["_id"]))
+
+
+async def reconcile_payments(start: datetime, end: datetime, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Reconcile gateway payments created in [start, end] with donations
+
+    Naive datetimes are taken as UTC; aware ones are converted to UTC.
+
+    Returns:
+        Report with per-kind counts and sample ids. Kinds include matched,
+        completed (repaired), effects_finished (interrupted completions re-driven),
+        would_complete / would_finish_effects (dry run), captured_without_donation,
+        amount_mismatch, second_capture_for_order, completed_but_gateway_<status>
+        and completed_not_seen_at_gateway (a late payment straddling the window
+        end can also land here).
+    """
+    start, end = _utc_naive(start), _utc_naive(end)
+    report = _Report(start, end, dry_run)
+    seen: Set[str] = set()
+    await _finish_pending_effects(report)
+
+    skip = 0
+    while True:
+        page = await list_payments(_unix(start), _unix(end), count=PAGE_SIZE, skip=skip)
+        if not page:
+            break
+        report.counts["gateway_payments"] += len(page)
+        await _reconcile_page(page, report, seen)
+        if len(page) < PAGE_SIZE:
+            break
+        skip += len(page)
+
+    # Reverse direction: completed donations created in the window whose payment never showed up
+    async for raw in Donation.get_motor_collection().find(
+        {"status": DonationStatus.COMPLETED.value, "created_at": {"$gte": start, "$lte": end}},
+        {"razorpay_payment_id": 1, "razorpay_order_id": 1},
+    ):
+        if raw.get("razorpay_payment_id") not in seen:
+            report.note(
+                "completed_not_seen_at_gateway",
+                donation_id=str(raw["_id"]),
+                payment_id=raw.get("razorpay_payment_id"),
+                order_id=raw.get("razorpay_order_id"),
+            )
+    return report.as_dict()
+
+
+async def run_reconciliation_job() -> None:
+    """Background task: reconcile the trailing RECONCILE_WINDOW_HOURS every RECONCILE_INTERVAL_SECONDS"""
+    while True:
+        await asyncio.sleep(settings.RECONCILE_INTERVAL_SECONDS)
+        end = datetime.utcnow()
+        try:
+            report = await reconcile_payments(end - timedelta(hours=settings.RECONCILE_WINDOW_HOURS), end)
+            print(f"🔎 Payment reconciliation: {report['counts']}")
+        except Exception as e:
+            print(f"⚠️  Payment reconciliation error: {e}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from app.core.database import init_db, close_db
+    from app.utils.razorpay import razorpay_gateway
+
+    end = _utc_naive(datetime.fromisoformat(args.to)) if args.to else datetime.utcnow()
+    start = _utc_naive(datetime.fromisoformat(args.start)) if args.start else end - timedelta(hours=args.hours)
+
+    await init_db()
+    try:
+        report = await reconcile_payments(start, end, dry_run=args.dry_run)
+    finally:
+        await razorpay_gateway.aclose()
+        await close_db()
+    print(json.dumps(report, indent=2, default=str))
+    unresolved = {k: v for k, v in report["counts"].items()
+                  if k not in ("gateway_payments", "captured", "matched", "completed", "effects_finished")}
+    return 1 if unresolved else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile gateway payments with donations")
+    parser.add_argument("--hours", type=float, default=24.0, help="Window length ending at --to (default: now)")
+    parser.add_argument("--from", dest="start", help="Window start, ISO format (UTC unless an offset is given)")
+    parser.add_argument("--to", help="Window end, ISO format (UTC unless an offset is given)")
+    parser.add_argument("--dry-run", action="store_true", help="Report only; do not complete donations")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,341 @@
+"""
+Stats Utilities
+Atomic $inc maintenance and from-source rebuild of platform rollups
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.models.stats import PlatformStats, StatsScope
+from app.utils.concurrency import gather_limited
+
+
+# Donors already counted in the platform total_donors (one document per donor ID)
+DONOR_MARKERS_COLLECTION = "stats_donors"
+
+# A rebuild retries rollups that received a concurrent $inc this many times
+REBUILD_ATTEMPTS = 3
+
+
+def _key(scope: StatsScope, ref_id: Any = None) -> Dict:
+    """Unique lookup key of a rollup document"""
+    return {"scope": scope.value, "ref_id": str(ref_id) if ref_id is not None else None}
+
+
+def _blank(scope: StatsScope, ref_id: Any = None) -> Dict:
+    """Zeroed rollup document used as the base for a rebuild"""
+    return {
+        **_key(scope, ref_id),
+        "total_raised": 0.0,
+        "total_disbursed": 0.0,
+        "total_donations": 0,
+        "total_donors": 0,
+        "active_campaigns": 0,
+        "verified_orphanages": 0,
+        "donations_by_status": {},
+    }
+
+
+async def increment_stats(
+    deltas: Dict[str, float],
+    orphanage_id: Any = None,
+    campaign_id: Any = None,
+    platform_deltas: Optional[Dict[str, float]] = None,
+) -> None:
+    """
+    Atomically apply counter deltas to the platform rollup and related scopes
+
+    Args:
+        deltas: Field deltas applied to the platform, orphanage and campaign rollups
+        orphanage_id: Orphanage whose rollup should also receive `deltas`
+        campaign_id: Campaign whose rollup should also receive `deltas`
+        platform_deltas: Extra deltas applied to the platform rollup only
+
+    All updates go out as one unordered bulk write of upserting `$inc` operations.
+    Failures are logged rather than raised; drift is repaired by rebuild_stats().
+    """
+    now = datetime.utcnow()
+    scoped = {k: v for k, v in deltas.items() if v}
+    platform = {**scoped, **{k: v for k, v in (platform_deltas or {}).items() if v}}
+
+    targets = [(_key(StatsScope.PLATFORM), platform)]
+    if orphanage_id is not None:
+        targets.append((_key(StatsScope.ORPHANAGE, orphanage_id), scoped))
+    if campaign_id is not None:
+        targets.append((_key(StatsScope.CAMPAIGN, campaign_id), scoped))
+
+    ops = [
+        UpdateOne(key, {"$inc": {**inc, "version": 1}, "$set": {"updated_at": now}}, upsert=True)
+        for key, inc in targets if inc
+    ]
+    if not ops:
+        return
+    try:
+        await PlatformStats.get_motor_collection().bulk_write(ops, ordered=False)
+    except Exception as e:
+        print(f"⚠️  Failed to update stats: {str(e)}")
+
+
+def _donor_markers():
+    return PlatformStats.get_motor_collection().database[DONOR_MARKERS_COLLECTION]
+
+
+async def count_new_donor(donor_id: Any) -> int:
+    """
+    Platform total_donors delta for a donor's completed donation
+
+    Returns 1 only for the first call per donor: the marker insert is atomic, so
+    two of one donor's payments completing at once cannot both count (or both
+    be skipped). Donors with completions from before markers existed are not
+    counted again.
+    """
+    from app.models.donation import Donation, DonationStatus
+
+    legacy = await Donation.get_motor_collection().count_documents(
+        {"donor.$id": donor_id, "status": DonationStatus.COMPLETED.value, "completed_from": {"$exists": False}},
+        limit=1,
+    )
+    try:
+        await _donor_markers().insert_one({"_id": donor_id, "counted_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        return 0
+    return 0 if legacy else 1
+
+
+async def get_stats(scope: StatsScope = StatsScope.PLATFORM, ref_id: Any = None) -> Optional[PlatformStats]:
+    """Fetch a single rollup document (one indexed lookup)"""
+    return await PlatformStats.find_one(_key(scope, ref_id))
+
+
+async def ensure_stats_seeded() -> bool:
+    """
+    Rebuild the rollups once if the platform document has never been rebuilt
+
+    The upserting $inc in increment_stats creates the platform document on the
+    first tracked write, counting from zero, so the document existing does not
+    mean it holds full totals; `rebuilt_at` is only set by rebuild_stats().
+
+    Returns:
+        True if a rebuild ran
+    """
+    platform = await PlatformStats.get_motor_collection().find_one(
+        _key(StatsScope.PLATFORM), {"rebuilt_at": 1}
+    )
+    if platform is not None and platform.get("rebuilt_at") is not None:
+        return False
+    await rebuild_stats()
+    return True
+
+
+async def _stored_versions() -> Dict[Tuple, int]:
+    """Version of every stored rollup, keyed by (scope, ref_id)"""
+    return {
+        (row["scope"], row["ref_id"]): row.get("version", 0)
+        async for row in PlatformStats.get_motor_collection().find({}, {"scope": 1, "ref_id": 1, "version": 1})
+    }
+
+
+async def _compute_rollups() -> Tuple[Dict[Tuple, Dict], List[Any]]:
+    """
+    Recompute every rollup from the source collections
+
+    Returns:
+        Rollup documents keyed by (scope, ref_id), and the IDs of distinct donors
+        with a completed donation
+    """
+    from app.models.campaign import Campaign, CampaignStatus
+    from app.models.donation import Donation, DonationStatus
+    from app.models.orphanage import Orphanage, OrphanageStatus
+    from app.models.transaction import Transaction, TransactionType, TransactionStatus
+
+    platform = _blank(StatsScope.PLATFORM)
+    orphanages: Dict[Any, Dict] = {}
+    campaigns: Dict[Any, Dict] = {}
+
+    # Campaign -> orphanage mapping and active counts
+    campaign_orphanage: Dict[Any, Any] = {}
+    cursor = Campaign.get_motor_collection().find({}, {"orphanage": 1, "status": 1})
+    async for row in cursor:
+        orphanage_id = getattr(row.get("orphanage"), "id", None)
+        campaign_orphanage[row["_id"]] = orphanage_id
+        campaigns[row["_id"]] = _blank(StatsScope.CAMPAIGN, row["_id"])
+        if orphanage_id is not None and orphanage_id not in orphanages:
+            orphanages[orphanage_id] = _blank(StatsScope.ORPHANAGE, orphanage_id)
+        if row.get("status") == CampaignStatus.ACTIVE.value:
+            platform["active_campaigns"] += 1
+            if orphanage_id is not None:
+                orphanages[orphanage_id]["active_campaigns"] += 1
+
+    def _apply(campaign_ref: Any, field: str, value: float) -> None:
+        campaign_id = getattr(campaign_ref, "id", campaign_ref)
+        platform[field] += value
+        if campaign_id in campaigns:
+            campaigns[campaign_id][field] += value
+            orphanage_id = campaign_orphanage.get(campaign_id)
+            if orphanage_id is not None:
+                orphanages[orphanage_id][field] += value
+
+    # Donations: raised per campaign, distinct donors, per-status counts. A completion
+    # counts once its stats step is marked (see apply_completion_effects); until then
+    # its $inc is still to come, so it stays under the status it completed from.
+    completed, refunded = DonationStatus.COMPLETED.value, DonationStatus.REFUNDED.value
+    facets = await Donation.aggregate([
+        {"$addFields": {"_counted": {"$and": [
+            {"$in": ["$status", [completed, refunded]]},
+            {"$or": [
+                {"$ne": ["$side_effects_applied", False]},
+                {"$in": ["stats", {"$ifNull": ["$effects_done", []]}]},
+            ]},
+        ]}}},
+        {"$facet": {
+            "by_campaign": [
+                {"$match": {"_counted": True}},
+                {"$group": {
+                    "_id": "$campaign",
+                    "raised": {"$sum": "$amount"},
+                    "count": {"$sum": {"$cond": [{"$eq": ["$status", completed]}, 1, 0]}},
+                }},
+            ],
+            "donors": [
+                {"$match": {"_counted": True}},
+                {"$group": {"_id": "$donor"}},
+            ],
+            "by_status": [
+                {"$group": {
+                    "_id": {"$cond": [
+                        {"$and": [{"$in": ["$status", [completed, refunded]]}, {"$not": ["$_counted"]}]},
+                        {"$ifNull": ["$completed_from", DonationStatus.INITIATED.value]},
+                        "$status",
+                    ]},
+                    "count": {"$sum": 1},
+                }},
+            ],
+        }},
+    ]).to_list()
+    donation_facets = facets[0] if facets else {}
+    for row in donation_facets.get("by_campaign", []):
+        _apply(row["_id"], "total_raised", row["raised"])
+        _apply(row["_id"], "total_donations", row["count"])
+    donor_ids = [
+        getattr(row["_id"], "id", row["_id"])
+        for row in donation_facets.get("donors", []) if row["_id"] is not None
+    ]
+    platform["total_donors"] = len(donor_ids)
+    by_status = {row["_id"]: row["count"] for row in donation_facets.get("by_status", [])}
+
+    # Refunds: subtracted once their stats step is marked (see refund_donation). A
+    # pending refund that already moved its donation to REFUNDED still counts it as
+    # completed; refunds from before the steps were tracked have no markers and count.
+    refunds = await Transaction.get_motor_collection().find(
+        {"transaction_type": TransactionType.REFUND.value, "status": TransactionStatus.COMPLETED.value},
+        {"amount": 1, "campaign": 1, "donation": 1, "gateway_transaction_id": 1},
+    ).to_list(None)
+    refund_donation_ids = list({link.id for link in (r.get("donation") for r in refunds) if link is not None})
+    refund_steps = {
+        row["_id"]: set(row.get("refund_effects_done") or [])
+        async for row in Donation.get_motor_collection().find(
+            {"_id": {"$in": refund_donation_ids}}, {"refund_effects_done": 1}
+        )
+    } if refund_donation_ids else {}
+    for refund in refunds:
+        refund_id = refund.get("gateway_transaction_id")
+        done = refund_steps.get(getattr(refund.get("donation"), "id", None), set())
+        if f"{refund_id}:ledger" in done and f"{refund_id}:stats" not in done:
+            if f"{refund_id}:status" in done:
+                _apply(refund.get("campaign"), "total_donations", 1)
+                by_status[refunded] = by_status.get(refunded, 0) - 1
+                by_status[completed] = by_status.get(completed, 0) + 1
+            continue
+        _apply(refund.get("campaign"), "total_raised", -refund["amount"])
+    platform["donations_by_status"] = by_status
+
+    platform["verified_orphanages"] = await Orphanage.find(
+        Orphanage.status == OrphanageStatus.VERIFIED
+    ).count()
+
+    docs = [platform, *orphanages.values(), *campaigns.values()]
+    return {(d["scope"], d["ref_id"]): d for d in docs}, donor_ids
+
+
+async def _write_if_unchanged(doc: Dict, version: Optional[int], now: datetime) -> bool:
+    """Store one rebuilt rollup unless a $inc reached it since its version was read"""
+    collection = PlatformStats.get_motor_collection()
+    if version is None:
+        # Not stored when the rebuild started; an $inc that created it meanwhile wins
+        try:
+            await collection.insert_one({**doc, "version": 0, "updated_at": now, "rebuilt_at": now})
+        except DuplicateKeyError:
+            return False
+        return True
+    result = await collection.replace_one(
+        {"scope": doc["scope"], "ref_id": doc["ref_id"], "version": version},
+        {**doc, "version": version + 1, "updated_at": now, "rebuilt_at": now},
+    )
+    return bool(result.matched_count)
+
+
+async def rebuild_stats() -> Dict[str, int]:
+    """
+    Recompute every rollup from the source collections and replace the stored ones
+
+    Used by the admin rebuild command to repair drift (e.g. after bulk deletes or
+    a failed increment). Stored versions are read before the source aggregation,
+    and a rollup is only replaced if its version is unchanged, so $inc updates
+    that land during the rebuild are never overwritten; those rollups are
+    recomputed again (up to REBUILD_ATTEMPTS). Completions and refunds whose
+    stats step has not run yet are left out, since their own $inc follows, and
+    processed refunds are subtracted as the live path does. Rollups whose
+    orphanage or campaign no longer exists are removed, under the same version
+    check.
+
+    Returns:
+        Number of rollup documents written per scope, plus rollups still
+        conflicting after the last attempt
+    """
+    pending: Optional[Set[Tuple]] = None
+    written = {scope.value: 0 for scope in StatsScope}
+    for attempt in range(REBUILD_ATTEMPTS):
+        versions = await _stored_versions()
+        rollups, donor_ids = await _compute_rollups()
+        now = datetime.utcnow()
+
+        if attempt == 0:
+            # Seed the donor markers so count_new_donor does not count these donors again
+            if donor_ids:
+                await _donor_markers().bulk_write(
+                    [UpdateOne({"_id": d}, {"$setOnInsert": {"counted_at": now}}, upsert=True) for d in donor_ids],
+                    ordered=False,
+                )
+            stale = [
+                key for key in versions
+                if key[0] != StatsScope.PLATFORM.value and key not in rollups
+            ]
+            await gather_limited(*(
+                PlatformStats.get_motor_collection().delete_one(
+                    {"scope": key[0], "ref_id": key[1], "version": versions[key]}
+                )
+                for key in stale
+            ), limit=16)
+
+        keys = [key for key in rollups if pending is None or key in pending]
+        results = await gather_limited(
+            *(_write_if_unchanged(rollups[key], versions.get(key), now) for key in keys),
+            limit=16,
+        )
+        pending = set()
+        for key, ok in zip(keys, results):
+            if ok:
+                written[key[0]] += 1
+            else:
+                pending.add(key)
+        if not pending:
+            break
+
+    return {
+        "platform": written[StatsScope.PLATFORM.value],
+        "orphanages": written[StatsScope.ORPHANAGE.value],
+        "campaigns": written[StatsScope.CAMPAIGN.value],
+        "conflicts": len(pending),
+    }
@@ -0,0 +1,161 @@
+"""
+Webhook Utilities
+Persist gateway webhooks to the inbox and apply them from a background worker
+
+The webhook route only verifies, stores (deduplicated by event ID) and acks.
+The worker claims inbox entries in batches with a lease, applies them through
+app.utils.payments, and retries failures with backoff.
+"""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.utils.donation_sweeper import restore_archived_donation
+from app.utils.payments import complete_donation, fail_donation, refund_donation
+
+
+# Events the worker applies; anything else is acknowledged and dropped
+HANDLED_EVENTS = {"payment.captured", "payment.failed", "refund.processed"}
+
+# Set when a new event is stored so the worker in this process picks it up without waiting
+webhook_wakeup = asyncio.Event()
+
+
+def webhook_event_id(header_event_id: Optional[str], body: bytes) -> str:
+    """Gateway event ID (X-Razorpay-Event-Id), or a hash of the signed body when absent"""
+    return header_event_id or f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+async def enqueue_webhook(event_id: str, event: str, payload: Dict[str, Any]) -> bool:
+    """
+    Store a webhook delivery in the inbox
+
+    Returns:
+        False if an entry with this event ID already exists (gateway redelivery)
+    """
+    try:
+        await WebhookEvent(event_id=event_id, event=event, payload=payload).insert()
+    except DuplicateKeyError:
+        return False
+    webhook_wakeup.set()
+    return True
+
+
+async def claim_webhook_batch(limit: int) -> List[Dict]:
+    """Lease up to `limit` due inbox entries (new, retry-due, or with an expired lease), oldest first"""
+    collection = WebhookEvent.get_motor_collection()
+    now = datetime.utcnow()
+    lease = now + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS)
+    claimed = []
+    for _ in range(limit):
+        entry = await collection.find_one_and_update(
+            {
+                "status": {"$in": [WebhookEventStatus.PENDING.value, WebhookEventStatus.PROCESSING.value]},
+                "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}],
+            },
+            {
+                "$set": {"status": WebhookEventStatus.PROCESSING.value, "locked_until": lease},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("received_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if entry is None:
+            break
+        claimed.append(entry)
+    return claimed
+
+
+def _entity(payload: Dict[str, Any], name: str) -> Dict[str, Any]:
+    return payload["payload"][name]["entity"]
+
+
+async def apply_webhook_event(event: str, payload: Dict[str, Any]) -> None:
+    """
+    Apply one webhook to Donation/Campaign/Transaction (idempotent)
+
+    Raises when the event cannot be applied yet (refund for an unknown payment,
+    completion still in progress), so the worker retries it with backoff.
+    """
+    if event in ("payment.captured", "payment.failed"):
+        payment = _entity(payload, "payment")
+        donation = await Donation.find_one(Donation.razorpay_order_id == payment["order_id"])
+        if not donation and event == "payment.captured":
+            # Paid after the sweeper archived the abandoned checkout
+            donation = await restore_archived_donation(payment["order_id"])
+            if not donation:
+                raise LookupError(f"No donation for captured order {payment['order_id']}")
+        if not donation:
+            return
+        if event == "payment.captured":
+            await complete_donation(donation, payment["id"], payment["order_id"])
+        else:
+            await fail_donation(donation, payment["id"])
+    elif event == "refund.processed":
+        refund = _entity(payload, "refund")
+        donation = await Donation.find_one(Donation.razorpay_payment_id == refund["payment_id"])
+        if not donation:
+            # Payment not recorded on the donation yet (refund arrived before the capture,
+            # or checkout stored another payment): fall back to the payment's order
+            order_id = payload["payload"].get("payment", {}).get("entity", {}).get("order_id")
+            if order_id:
+                donation = await Donation.find_one(Donation.razorpay_order_id == order_id)
+        if not donation:
+            # Raise rather than acknowledge, so the inbox retries with backoff
+            raise LookupError(f"No donation for refunded payment {refund['payment_id']}")
+        if donation.status not in (DonationStatus.COMPLETED, DonationStatus.REFUNDED) or not donation.side_effects_applied:
+            # The capture has not been applied yet; refunding now would reverse totals never added
+            raise RuntimeError(f"Donation {donation.id} is not completed yet; refund will be retried")
+        await refund_donation(donation, refund["id"], refund["amount"] / 100)
+
+
+async def process_webhook_batch() -> int:
+    """Claim and apply one batch of inbox entries; returns the number claimed"""
+    collection = WebhookEvent.get_motor_collection()
+    entries = await claim_webhook_batch(settings.WEBHOOK_BATCH_SIZE)
+    for entry in entries:
+        try:
+            await apply_webhook_event(entry["event"], entry["payload"])
+        except Exception as e:
+            attempts = entry["attempts"]
+            gave_up = attempts >= settings.WEBHOOK_MAX_ATTEMPTS
+            retry_at = datetime.utcnow() + timedelta(
+                seconds=settings.WEBHOOK_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+            )
+            await collection.update_one({"_id": entry["_id"]}, {"$set": {
+                "status": (WebhookEventStatus.FAILED if gave_up else WebhookEventStatus.PENDING).value,
+                "locked_until": None if gave_up else retry_at,
+                "last_error": str(e)[:500],
+            }})
+            print(f"⚠️  Webhook {entry['event_id']} ({entry['event']}) attempt {attempts} failed: {e}")
+            continue
+        await collection.update_one({"_id": entry["_id"]}, {"$set": {
+            "status": WebhookEventStatus.PROCESSED.value,
+            "locked_until": None,
+            "processed_at": datetime.utcnow(),
+        }})
+    return len(entries)
+
+
+async def run_webhook_worker() -> None:
+    """Background task: drain the inbox, then wait for a new event or WEBHOOK_POLL_INTERVAL_SECONDS"""
+    while True:
+        try:
+            claimed = await process_webhook_batch()
+        except Exception as e:
+            print(f"⚠️  Webhook worker error: {e}")
+            claimed = 0
+        if claimed >= settings.WEBHOOK_BATCH_SIZE:
+            continue
+        try:
+            await asyncio.wait_for(webhook_wakeup.wait(), timeout=settings.WEBHOOK_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        webhook_wakeup.clear()
@@ -0,0 +1,57 @@
+"""
+Token Decode Benchmark
+Microbenchmark for decode_access_token: each JWT backend, uncached vs verified-token cache
+
+Run from the backend directory (settings are read from .env):
+    python -m benchmarks.decode_token --iterations 20000
+"""
+import argparse
+import time
+from typing import Callable
+
+from app.core import security
+from app.core.config import settings
+from app.core.jwt_backends import BACKENDS, get_backend
+
+
+def _time_per_call(fn: Callable[[], object], iterations: int) -> float:
+    """Mean microseconds per call"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark decode_access_token")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {"sub": "64b7f0c2e4b0a1a2b3c4d5e6", "email": "bench@example.com", "role": "donor"}
+    print(f"{args.iterations} decodes per row, algorithm {settings.ALGORITHM}")
+    cache_size = settings.JWT_DECODE_CACHE_SIZE or 1024
+    security.token_cache.maxsize = cache_size
+
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except ImportError:
+            print(f"{name:<8} not installed, skipped")
+            continue
+        security.jwt_backend = backend
+        token = security.create_access_token(claims)
+
+        # Uncached: signature check on every call
+        settings.JWT_DECODE_CACHE_SIZE = 0
+        uncached = _time_per_call(lambda: security.decode_access_token(token), args.iterations)
+
+        # Cached: the first call verifies, the rest hit token_cache
+        settings.JWT_DECODE_CACHE_SIZE = cache_size
+        security.token_cache.clear()
+        cached = _time_per_call(lambda: security.decode_access_token(token), args.iterations)
+
+        print(f"{name:<8} uncached {uncached:8.2f} us/call   cached {cached:8.2f} us/call   ({uncached / cached:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
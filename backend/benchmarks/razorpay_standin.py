@@ -0,0 +1,143 @@
+"""
+Razorpay Stand-in Server
+Minimal in-memory imitation of the Razorpay REST endpoints used by the backend
+
+For offline development and load tests. Start it, then point the backend at it:
+    uvicorn benchmarks.razorpay_standin:app --port 9100
+    RAZORPAY_API_BASE=http://localhost:9100/v1
+
+Knobs (environment variables):
+    STANDIN_LATENCY_MS   added delay per request (default 50)
+    STANDIN_FAILURE_RATE fraction of requests answered with 503 (default 0)
+"""
+import asyncio
+import os
+import random
+import secrets
+import time
+from typing import Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+
+
+LATENCY_MS = float(os.getenv("STANDIN_LATENCY_MS", "50"))
+FAILURE_RATE = float(os.getenv("STANDIN_FAILURE_RATE", "0"))
+
+app = FastAPI(title="Razorpay stand-in")
+
+orders: Dict[str, Dict] = {}
+payments: Dict[str, Dict] = {}
+refunds: Dict[str, Dict] = {}
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{secrets.token_hex(7)}"
+
+
+@app.middleware("http")
+async def simulate_network(request, call_next):
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if FAILURE_RATE and random.random() < FAILURE_RATE:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": {"code": "SERVER_ERROR", "description": "Injected failure"}},
+        )
+    return await call_next(request)
+
+
+@app.post("/v1/orders")
+async def create_order(body: Dict):
+    order_id = _new_id("order")
+    orders[order_id] = {
+        "id": order_id,
+        "entity": "order",
+        "amount": body["amount"],
+        "amount_paid": 0,
+        "currency": body.get("currency", "INR"),
+        "status": "created",
+        "notes": body.get("notes", {}),
+        "created_at": int(time.time()),
+    }
+    return orders[order_id]
+
+
+@app.get("/v1/orders/{order_id}")
+async def fetch_order(order_id: str):
+    if order_id not in orders:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The id provided does not exist")
+    return orders[order_id]
+
+
+@app.get("/v1/orders/{order_id}/payments")
+async def fetch_order_payments(order_id: str):
+    if order_id not in orders:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The id provided does not exist")
+    items = [p for p in payments.values() if p["order_id"] == order_id]
+    return {"entity": "collection", "count": len(items), "items": items}
+
+
+@app.get("/v1/payments")
+async def list_payments(
+    from_ts: int = Query(default=0, alias="from"),
+    to_ts: Optional[int] = Query(default=None, alias="to"),
+    count: int = Query(default=10, le=100),
+    skip: int = 0,
+):
+    # Newest first, like the real endpoint
+    items = sorted(
+        (p for p in payments.values() if p["created_at"] >= from_ts and (to_ts is None or p["created_at"] <= to_ts)),
+        key=lambda p: p["created_at"],
+        reverse=True,
+    )[skip:skip + count]
+    return {"entity": "collection", "count": len(items), "items": items}
+
+
+@app.get("/v1/payments/{payment_id}")
+async def fetch_payment(payment_id: str):
+    if payment_id not in payments:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The id provided does not exist")
+    return payments[payment_id]
+
+
+@app.post("/v1/payments/{payment_id}/refund")
+async def refund(payment_id: str, body: Optional[Dict] = None):
+    payment = payments.get(payment_id)
+    if not payment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The id provided does not exist")
+    refund_id = _new_id("rfnd")
+    refunds[refund_id] = {
+        "id": refund_id,
+        "entity": "refund",
+        "payment_id": payment_id,
+        "amount": (body or {}).get("amount", payment["amount"]),
+        "status": "processed",
+        "created_at": int(time.time()),
+    }
+    payment["amount_refunded"] = payment.get("amount_refunded", 0) + refunds[refund_id]["amount"]
+    return refunds[refund_id]
+
+
+@app.post("/_standin/orders/{order_id}/pay")
+async def simulate_payment(order_id: str, captured: bool = True):
+    """Test helper (not a Razorpay endpoint): settle an order as captured or failed"""
+    order = orders.get(order_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    payment_id = _new_id("pay")
+    payments[payment_id] = {
+        "id": payment_id,
+        "entity": "payment",
+        "order_id": order_id,
+        "amount": order["amount"],
+        "currency": order["currency"],
+        "status": "captured" if captured else "failed",
+        "created_at": int(time.time()),
+    }
+    if captured:
+        order["status"] = "paid"
+        order["amount_paid"] = order["amount"]
+    else:
+        order["status"] = "attempted"
+    return payments[payment_id]
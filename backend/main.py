@@ -7,11 +7,24 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from app.core.config import settings
 from app.core.database import init_db, close_db, get_db
 from app.core.bootstrap import ensure_admin_user
+from app.core.index_advisor import run_index_advisor
+from app.core.cache import response_cache
+from app.core.singleflight import single_flight_group
+from app.core.security import password_executor
+from app.utils.razorpay import razorpay_gateway
+from app.utils.email import smtp_pool
+from app.utils.email_outbox import email_outbox_stats, run_email_worker
+from app.utils.webhooks import run_webhook_worker
+from app.utils.donation_sweeper import run_donation_sweeper
+from app.utils.reconciliation import run_reconciliation_job
+from app.utils.counters import counters_sharded, flush_campaign_counters, run_counter_flusher
+from app.utils.stats import ensure_stats_seeded
 from app.api.routes import auth, users, orphanages, campaigns, donations, admin, reports
 from app.api.routes import uploads
 
@@ -26,7 +39,38 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         # Don't crash the app if bootstrap fails; log instead
         print(f"⚠️  Admin bootstrap error: {e}")
+    # Fold counter shards left over from a previous run (or from sharded mode being switched off)
+    try:
+        await flush_campaign_counters()
+    except Exception as e:
+        print(f"⚠️  Counter flush error: {e}")
+    # Seed the stats rollups from source on the first start after they were introduced
+    try:
+        await ensure_stats_seeded()
+    except Exception as e:
+        print(f"⚠️  Stats seeding error: {e}")
+    if settings.INDEX_ADVISOR_ON_STARTUP:
+        try:
+            await run_index_advisor()
+        except Exception as e:
+            print(f"⚠️  Index advisor error: {e}")
+    flusher = asyncio.create_task(run_counter_flusher()) if counters_sharded() else None
+    webhook_worker = asyncio.create_task(run_webhook_worker())
+    email_worker = asyncio.create_task(run_email_worker())
+    sweeper = asyncio.create_task(run_donation_sweeper()) if settings.DONATION_SWEEP_ENABLED else None
+    reconciler = asyncio.create_task(run_reconciliation_job()) if settings.RECONCILE_ENABLED else None
     yield
+    if reconciler:
+        reconciler.cancel()
+    if sweeper:
+        sweeper.cancel()
+    if flusher:
+        flusher.cancel()
+    webhook_worker.cancel()
+    email_worker.cancel()
+    password_executor.shutdown()
+    await razorpay_gateway.aclose()
+    await smtp_pool.aclose()
     await close_db()
 
 
@@ -46,6 +90,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination token for list endpoints
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Static files for uploads
@@ -100,6 +146,31 @@ async def db_health_check():
         return {"status": "error", "message": str(e)}
 
 
+@app.get("/health/cache")
+async def cache_health_check():
+    """Response cache size, hit/miss and request coalescing metrics (per worker)"""
+    return {
+        "status": "ok",
+        "response_cache": response_cache.stats(),
+        "single_flight": single_flight_group.stats(),
+    }
+
+
+@app.get("/health/auth")
+async def auth_health_check():
+    """bcrypt pool utilisation and queue depth (per worker)"""
+    return {"status": "ok", "password_hashing": password_executor.stats()}
+
+
+@app.get("/health/email")
+async def email_health_check():
+    """Outbox depth and oldest unsent age, plus SMTP pool usage and send rate (pool stats are per worker)"""
+    try:
+        return {"status": "ok", "outbox": await email_outbox_stats()}
+    except Exception as e:
+        return {"status": "error", "message": str(e), "smtp": smtp_pool.stats()}
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",